@@ -1,14 +1,10 @@
-try:
-    from . import langchain
-except ImportError:
-    pass
+# Adapters are imported on first access (PEP 562) so that loading one framework
+# integration does not pull in the others. Registry lookups import them on demand.
+import importlib
 
-try:
-    from . import llamaindex
-except ImportError:
-    pass
+__all__ = ["langchain", "llamaindex", "pyterrier"]
 
-try:
-    from . import pyterrier
-except ImportError:
-    pass
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
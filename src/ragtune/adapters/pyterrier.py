@@ -55,9 +55,14 @@ class PyTerrierRetriever(BaseRetriever):
         # Run retrieval
         res = self.pt_transformer.transform(queries_df)
         # print(f"DEBUG: PyTerrier retrieved {len(res)} rows for top_k={top_k}")
-        
-        # Sort by score just in case and take top_k
-        res = res.sort_values("score", ascending=False).head(top_k)
+        if res.empty:
+            return []
+
+        # Sort by score just in case and take top_k. PyTerrier usually returns
+        # results already ranked, in which case the sort is skipped.
+        if not res["score"].is_monotonic_decreasing:
+            res = res.sort_values("score", ascending=False)
+        res = res.head(top_k)
         
         results = []
         for i, row in res.iterrows():
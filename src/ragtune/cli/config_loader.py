@@ -1,20 +1,92 @@
 import yaml
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Hashable
 from pathlib import Path
 from ragtune.registry import registry
+from ragtune.utils.config import YamlLoader
 from ragtune.core.controller import RAGtuneController
 from ragtune.core.budget import CostBudget
-from ragtune.core.interfaces import BaseRetriever, BaseReranker, BaseReformulator, BaseAssembler, BaseScheduler, BaseEstimator
+
+# Component slots in controller order, with the config used when a slot is omitted.
+DEFAULT_COMPONENTS = {
+    "retriever": {"type": "bm25"},
+    "reranker": {"type": "noop"},
+    "reformulator": {"type": "noop"},
+    "assembler": {"type": "greedy"},
+    "scheduler": {"type": "graceful-degradation"},
+    "estimator": {"type": "baseline"},
+}
 
 class ConfigLoader:
     """
     Loads RAGtune pipeline configuration from YAML and instantiates components.
     """
+
+    # Compiled component factories keyed by config shape (categories + component
+    # types, excluding param values), least recently used first. Grid-search style
+    # workloads rebuild the same pipeline many times with only the params
+    # changing, so registry lookups and type dispatch are resolved once per shape.
+    # The cache is dropped when the registry reports a re-registered name.
+    _factory_cache: "OrderedDict[Hashable, Callable[..., Any]]" = OrderedDict()
+    _factory_cache_size = 128
+    _registry_version = registry.version
     
     @staticmethod
     def load_config(path: Path) -> Dict[str, Any]:
         with open(path, "r") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop compiled factories; re-registering a component name does this automatically."""
+        cls._factory_cache.clear()
+        cls._registry_version = registry.version
+
+    @staticmethod
+    def _shape(conf: Any) -> Hashable:
+        if isinstance(conf, list):
+            return tuple(ConfigLoader._shape(c) for c in conf)
+        if isinstance(conf, dict):
+            return ("type", conf.get("type", "default"))
+        return None
+
+    @classmethod
+    def _compile_component(cls, category: str, conf: Any) -> Callable[[Any], Any]:
+        """Resolves a component config once into a builder taking the same-shaped config."""
+        if isinstance(conf, list):
+            builders = [cls._compile_component(category, c) for c in conf]
+            # Special case for estimators: wrap in CompositeEstimator
+            if category == "estimator":
+                from ragtune.components.estimators import CompositeEstimator
+                return lambda c: CompositeEstimator(estimators=[b(x) for b, x in zip(builders, c)])
+            return lambda c: [b(x) for b, x in zip(builders, c)]
+
+        if not isinstance(conf, dict):
+            return lambda c: c
+
+        comp_type = conf.get("type", "default")
+
+        getter_map = {
+            "retriever": registry.get_retriever,
+            "reranker": registry.get_reranker,
+            "reformulator": registry.get_reformulator,
+            "assembler": registry.get_assembler,
+            "scheduler": registry.get_scheduler,
+            "estimator": registry.get_estimator,
+            "feedback": registry.get_feedback,
+        }
+
+        getter = getter_map.get(category)
+        if not getter:
+            raise ValueError(f"Unknown component category: {category}")
+
+        comp_cls = getter(comp_type)
+        if not comp_cls:
+            available = registry.list_names(category)
+            raise ValueError(f"Component type '{comp_type}' not found for category '{category}'. Available: {available}")
+
+        # Params are passed through as-is; nested component configs are not instantiated.
+        return lambda c: comp_cls(**c.get("params", {}))
 
     @classmethod
     def create_controller(cls, config: Dict[str, Any], budget_overrides: Optional[Dict[str, float]] = None) -> RAGtuneController:
@@ -29,76 +101,26 @@ class ConfigLoader:
 
         budget = CostBudget(limits=limits)
 
-        from ragtune.core.interfaces import BaseRetriever, BaseReranker, BaseReformulator, BaseAssembler, BaseScheduler, BaseEstimator, BaseFeedback
-        
-        def create_component(category: str, conf: Any):
-            if isinstance(conf, list):
-                # Special case for estimators: wrap in CompositeEstimator
-                if category == "estimator":
-                    sub_estimators = [create_component("estimator", c) for c in conf]
-                    from ragtune.components.estimators import CompositeEstimator
-                    return CompositeEstimator(estimators=sub_estimators)
-                return [create_component(category, c) for c in conf]
-
-            if not isinstance(conf, dict):
-                return conf
-
-            comp_type = conf.get("type", "default")
-            params = conf.get("params", {})
-            
-            getter_map = {
-                "retriever": registry.get_retriever,
-                "reranker": registry.get_reranker,
-                "reformulator": registry.get_reformulator,
-                "assembler": registry.get_assembler,
-                "scheduler": registry.get_scheduler,
-                "estimator": registry.get_estimator,
-                "feedback": registry.get_feedback,
-            }
-            
-            getter = getter_map.get(category)
-            if not getter:
-                raise ValueError(f"Unknown component category: {category}")
-            
-            comp_cls = getter(comp_type)
-            if not comp_cls:
-                available = list(registry.list_all().get(category, {}).keys())
-                raise ValueError(f"Component type '{comp_type}' not found for category '{category}'. Available: {available}")
-            
-            # Recursively handle any params that might be component configs
-            processed_params = {}
-            for k, v in params.items():
-                if isinstance(v, dict) and "type" in v:
-                    # Heuristic: if it's a dict with 'type', it might be a sub-component
-                    # This is a bit vague, but for now we'll assume it's a component if it matches a category
-                    # or if the parent component expects it.
-                    # For RAGtune v0.56, we mainly care about the top-level lists.
-                    processed_params[k] = v
-                else:
-                    processed_params[k] = v
-
-            return comp_cls(**processed_params)
-
-        # Instantiate implementation
-        retriever = create_component("retriever", components_conf.get("retriever", {"type": "bm25"}))
-        reranker = create_component("reranker", components_conf.get("reranker", {"type": "noop"}))
-        reformulator = create_component("reformulator", components_conf.get("reformulator", {"type": "noop"}))
-        assembler = create_component("assembler", components_conf.get("assembler", {"type": "greedy"}))
-        scheduler = create_component("scheduler", components_conf.get("scheduler", {"type": "graceful-degradation"}))
-        estimator = create_component("estimator", components_conf.get("estimator", {"type": "baseline"}))
-
-        # Feedback
-        feedback = None
+        slots = {name: components_conf.get(name, default) for name, default in DEFAULT_COMPONENTS.items()}
         if feedback_conf:
-            feedback = create_component("feedback", feedback_conf)
-
-        return RAGtuneController(
-            retriever=retriever,
-            reformulator=reformulator,
-            reranker=reranker,
-            assembler=assembler,
-            scheduler=scheduler,
-            estimator=estimator,
-            budget=budget,
-            feedback=feedback
-        )
+            slots["feedback"] = feedback_conf
+
+        if cls._registry_version != registry.version:
+            cls.clear_cache()
+        shape = tuple((name, cls._shape(conf)) for name, conf in slots.items())
+        cache = cls._factory_cache
+        factory = cache.get(shape)
+        if factory is not None:
+            cache.move_to_end(shape)
+        else:
+            builders = {name: cls._compile_component(name, conf) for name, conf in slots.items()}
+
+            def factory(slot_confs: Dict[str, Any], budget: CostBudget) -> RAGtuneController:
+                built = {name: build(slot_confs[name]) for name, build in builders.items()}
+                return RAGtuneController(budget=budget, **built)
+
+            cache[shape] = factory
+            if len(cache) > cls._factory_cache_size:
+                cache.popitem(last=False)
+
+        return factory(slots, budget)
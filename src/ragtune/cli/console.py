@@ -0,0 +1,10 @@
+# rich is imported on first use so `ragtune --help` does not pay for loading it.
+_console = None
+
+def get_console():
+    """Returns the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
@@ -1,19 +1,28 @@
 import typer
-import yaml
 from typing import Optional, List
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from ragtune.registry import registry
-from ragtune.core.controller import RAGtuneController
-from ragtune.core.budget import CostBudget
-try:
-    import ragtune.indexing  # noqa
-except ImportError:
-    pass
+from ragtune.cli.console import get_console
 
+# Heavier dependencies (yaml, rich, controller, registry) are imported inside the
+# commands that need them so `ragtune --help` does not pay for loading them.
 app = typer.Typer(help="RAGtune CLI: Budget-aware RAG middleware.")
-console = Console()
+
+# Names formerly imported at module level, resolved on first access (PEP 562).
+_LAZY_ATTRS = {
+    "registry": ("ragtune.registry", "registry"),
+    "RAGtuneController": ("ragtune.core.controller", "RAGtuneController"),
+    "CostBudget": ("ragtune.core.budget", "CostBudget"),
+    "ConfigLoader": ("ragtune.cli.config_loader", "ConfigLoader"),
+}
+
+def __getattr__(name: str):
+    if name == "console":
+        return get_console()
+    if name in _LAZY_ATTRS:
+        import importlib
+        module_name, attr = _LAZY_ATTRS[name]
+        return getattr(importlib.import_module(module_name), attr)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @app.command()
 def init(
@@ -23,6 +32,9 @@ def init(
     """
     Initialize a new RAGtune configuration file.
     """
+    from ragtune.utils.config import dump_config
+    console = get_console()
+
     if path.exists():
         from rich.prompt import Confirm, Prompt
         console.print(f"[bold yellow]Warning:[/bold yellow] File {path} already exists.")
@@ -78,27 +90,35 @@ def init(
             }
         }
     
-    with open(path, "w") as f:
-        yaml.dump(config_data, f, sort_keys=False)
+    dump_config(config_data, path)
         
     console.print(f"[bold green]Success![/bold green] Created configuration at {path}")
 
-from ragtune.cli.config_loader import ConfigLoader
-
 @app.command("list")
-def list_components():
+def list_components(
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Import each component to show its description.")
+):
     """
     List all registered RAGtune components.
     """
-    # Force load default components/adapters
-    try:
-        import ragtune.adapters  # noqa
-        import ragtune.components # noqa
-    except ImportError:
-        pass
+    from rich.panel import Panel
+    from ragtune.registry import registry
+    console = get_console()
 
     console.print(Panel("[bold blue]Registered Components[/bold blue]"))
-    
+
+    if not verbose:
+        # Names only: read from the registry's static map without importing any backend
+        for category in registry.list_all():
+            names = registry.list_names(category)
+            console.print(f"\n[bold]{category.capitalize()}s:[/bold]")
+            if not names:
+                console.print("  [dim]None[/dim]")
+            for name in names:
+                console.print(f"  - [cyan]{name}[/cyan]")
+        return
+
+    registry.load_builtins()
     all_components = registry.list_all()
     
     for category, components in all_components.items():
@@ -116,11 +136,16 @@ def run(
     query: str = typer.Option(..., "--query", "-q", help="The query to run."),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed execution trace."),
     collection_path: Optional[str] = typer.Option(None, "--collection-path", help="Override the data collection path in the config."),
-    limits: Optional[List[str]] = typer.Option(None, "--limit", "-l", help="Override budget limits (e.g. --limit tokens=1000). Can be used multiple times.")
+    limits: Optional[List[str]] = typer.Option(None, "--limit", "-l", help="Override budget limits (e.g. --limit tokens=1000). Can be used multiple times."),
+    debug: bool = typer.Option(False, "--debug", help="Print the full traceback on errors.")
 ):
     """
     Run a RAGtune pipeline from a configuration file.
     """
+    from rich.panel import Panel
+    from ragtune.cli.config_loader import ConfigLoader
+    console = get_console()
+
     if not config_path.exists():
         console.print(f"[bold red]Error:[/bold red] Config file {config_path} not found.")
         raise typer.Exit(code=1)
@@ -135,13 +160,6 @@ def run(
             except ValueError:
                 console.print(f"[bold yellow]Warning:[/bold yellow] Invalid limit format: {limit_str}. Expected KEY=VALUE")
 
-    # Force load default components/adapters to ensure registry is populated
-    try:
-        import ragtune.adapters  # noqa
-        import ragtune.components # noqa
-    except ImportError:
-        pass
-
     try:
         console.print(f"[dim]Loading config from {config_path}...[/dim]")
         config_data = ConfigLoader.load_config(config_path)
@@ -182,8 +200,9 @@ def run(
 
     except Exception as e:
         console.print(f"[bold red]Runtime Error:[/bold red] {e}")
-        import traceback
-        traceback.print_exc()
+        if debug:
+            import traceback
+            traceback.print_exc()
         raise typer.Exit(code=1)
 
 @app.command()
@@ -194,6 +213,12 @@ def validate(
     """
     Validate a RAGtune configuration file against the v0.2 schema.
     """
+    import yaml
+    from rich.panel import Panel
+    from ragtune.registry import registry
+    from ragtune.utils.config import YamlLoader
+    console = get_console()
+
     if not config_path.exists():
         console.print(f"[bold red]Error:[/bold red] File {config_path} not found.")
         raise typer.Exit(code=1)
@@ -203,41 +228,37 @@ def validate(
         
         console.print(f"[dim]Validating schema for {config_path}...[/dim]")
         with open(config_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
         
         # 1. Pydantic Schema Validation
         config_obj = RAGtuneConfig(**data)
         
-        # 2. Registry Check
-        # Force load components
-        try:
-            import ragtune.adapters  # noqa
-            import ragtune.components # noqa
-        except ImportError:
-            pass
-            
+        # 2. Registry Check (getters import built-in components on demand)
         console.print("[dim]Checking registry for components...[/dim]")
         pipeline = config_obj.pipeline
         components = pipeline.components
         
         problems = []
         
-        check_list = [
-            ("retriever", components.retriever, registry.get_retriever),
-            ("reranker", components.reranker, registry.get_reranker),
-            ("reformulator", components.reformulator, registry.get_reformulator),
-            ("assembler", components.assembler, registry.get_assembler),
-            ("scheduler", components.scheduler, registry.get_scheduler),
-        ]
-        
-        # Handle estimator separately as it can be a list
-        estimators = components.estimator if isinstance(components.estimator, list) else [components.estimator]
-        for est in estimators:
-            check_list.append(("estimator", est, registry.get_estimator))
+        getters = {
+            "retriever": registry.get_retriever,
+            "reranker": registry.get_reranker,
+            "reformulator": registry.get_reformulator,
+            "assembler": registry.get_assembler,
+            "scheduler": registry.get_scheduler,
+            "estimator": registry.get_estimator,
+        }
+
+        # Extract (category, type) pairs from the model once; estimator can be a list
+        references = []
+        for cat in getters:
+            comp = getattr(components, cat, None)
+            references.extend((cat, c.type) for c in (comp if isinstance(comp, list) else [comp]) if c is not None)
 
-        for cat, comp, getter in check_list:
-            if not getter(comp.type):
-                problems.append(f"Component '{comp.type}' not found in registry for category '{cat}'.")
+        # Look up each distinct pair once
+        for cat, comp_type in dict.fromkeys(references):
+            if not getters[cat](comp_type):
+                problems.append(f"Component '{comp_type}' not found in registry for category '{cat}'.")
 
         # 3. Path / Index checks
         if not allow_missing_index and pipeline.index:
@@ -267,11 +288,14 @@ def visualize(
     Displays an ASCII flow diagram of the pipeline components.
     Use --edit to interactively modify components and see diff before saving.
     """
+    from ragtune.cli.config_loader import ConfigLoader
+    console = get_console()
+
     if not config_path.exists():
         console.print(f"[bold red]Error:[/bold red] Config file {config_path} not found.")
         raise typer.Exit(code=1)
 
-    from ragtune.cli.visualize import render_pipeline_flow, run_interactive_editor, show_diff, save_config
+    from ragtune.cli.visualize import render_pipeline_flow, render_pipeline_flow_plain, run_interactive_editor, show_diff, save_config
 
     try:
         config_data = ConfigLoader.load_config(config_path)
@@ -279,6 +303,13 @@ def visualize(
         console.print(f"[bold red]Error loading config:[/bold red] {e}")
         raise typer.Exit(code=1)
 
+    # Piped/scripted output gets a plain listing without box layout
+    if not console.is_terminal and not edit:
+        render_pipeline_flow_plain(config_data)
+        if output:
+            console.print("[yellow]Warning:[/yellow] --output is only used with --edit flag.")
+        return
+
     # Display visualization
     render_pipeline_flow(config_data)
 
@@ -294,11 +325,17 @@ def visualize(
 @app.command()
 def index(
     config_path: Path = typer.Argument(..., help="Path to the configuration file."),
-    collection_path: Optional[str] = typer.Option(None, "--collection-path", help="Override the data collection path in the config.")
+    collection_path: Optional[str] = typer.Option(None, "--collection-path", help="Override the data collection path in the config."),
+    debug: bool = typer.Option(False, "--debug", help="Print the full traceback on errors.")
 ):
     """
     Build an index based on the configuration file.
     """
+    import yaml
+    from ragtune.registry import registry
+    from ragtune.utils.config import YamlLoader
+    console = get_console()
+
     if not config_path.exists():
         console.print(f"[bold red]Error:[/bold red] File {config_path} not found.")
         raise typer.Exit(code=1)
@@ -306,7 +343,7 @@ def index(
     try:
         from ragtune.config.models import RAGtuneConfig
         with open(config_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
         
         config_obj = RAGtuneConfig(**data)
         pipeline = config_obj.pipeline
@@ -323,12 +360,6 @@ def index(
             console.print("[bold red]Error:[/bold red] Config must have 'pipeline.data' and 'pipeline.index' sections to run indexing.")
             raise typer.Exit(code=1)
 
-        # Force load indexers
-        try:
-            import ragtune.indexing.pyterrier_indexer # noqa
-        except ImportError:
-            pass
-
         framework = pipeline.index.framework
         indexer_cls = registry.get_indexer(framework)
         
@@ -364,8 +395,9 @@ def index(
 
     except Exception as e:
         console.print(f"[bold red]Indexing Error:[/bold red] {e}")
-        import traceback
-        traceback.print_exc()
+        if debug:
+            import traceback
+            traceback.print_exc()
         raise typer.Exit(code=1)
 
 def main():
@@ -5,31 +5,65 @@ Provides ASCII flow diagram rendering and component-level editing
 with diff preview before saving changes.
 """
 
+import bisect
 import copy
 import difflib
+import functools
+import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
 import yaml
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
-from rich.text import Text
 
+from ragtune.cli.console import get_console
 from ragtune.registry import registry
+from ragtune.utils.config import YamlDumper
+
+if TYPE_CHECKING:
+    from rich.panel import Panel
+
+def __getattr__(name: str):
+    # The module-level console this module used to create, now the shared one
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-console = Console()
 
 # Component display order for the flow diagram
 COMPONENT_ORDER = ["retriever", "reformulator", "reranker", "assembler"]
 SUPPORT_COMPONENTS = ["scheduler", "estimator"]
 
+# Literal spellings recognised by parse_value
+_TRUE_STRINGS = frozenset(("true", "yes"))
+_FALSE_STRINGS = frozenset(("false", "no"))
+_NONE_STRINGS = frozenset(("none", "null", ""))
+_INT_RE = re.compile(r"[-+]?\d+")
+
+# show_diff uses the single-pass line diff below this many lines (both sides)
+FAST_DIFF_MAX_LINES = 400
+
+
+def format_budget(limits: Dict[str, Any]) -> str:
+    """Format budget limits as a single 'key=value | ...' line."""
+    budget_parts = []
+    for key, value in limits.items():
+        if isinstance(value, float) and value == int(value):
+            value = int(value)
+        budget_parts.append(f"{key}={value}")
+    return " | ".join(budget_parts)
+
 
 class ComponentBox:
     """Renders a single component as an ASCII box."""
 
+    __slots__ = ("name", "comp_type", "params")
+
     WIDTH = 12
+    # Available space for type value: WIDTH - len(" type: ") - len("│") = WIDTH - 7
+    MAX_TYPE_LEN = WIDTH - 7
+    TOP = f"┌{'─' * WIDTH}┐"
+    MID = f"├{'─' * WIDTH}┤"
+    BOTTOM = f"└{'─' * WIDTH}┘"
 
     def __init__(self, name: str, comp_type: str, params: Optional[Dict[str, Any]] = None):
         self.name = name
@@ -38,25 +72,23 @@ class ComponentBox:
 
     def render(self) -> List[str]:
         """Return lines for the component box."""
-        # Available space for type value: WIDTH - len(" type: ") - len("│") = WIDTH - 7
-        max_type_len = self.WIDTH - 7
-        type_display = self.comp_type[:max_type_len] if len(self.comp_type) > max_type_len else self.comp_type
-
-        lines = [
-            f"┌{'─' * self.WIDTH}┐",
+        return [
+            self.TOP,
             f"│{self.name.upper():^{self.WIDTH}}│",
-            f"├{'─' * self.WIDTH}┤",
-            f"│ type: {type_display:<{max_type_len}}│",
-            f"└{'─' * self.WIDTH}┘",
+            self.MID,
+            f"│ type: {self.comp_type[:self.MAX_TYPE_LEN]:<{self.MAX_TYPE_LEN}}│",
+            self.BOTTOM,
         ]
-        return lines
 
 
 class PipelineFlowRenderer:
     """Renders the complete pipeline visualization."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], box_cache: Optional[Dict[Tuple[str, str], List[str]]] = None):
         self.config = config
+        # Rendered box lines keyed by (name, type); a box depends on nothing else,
+        # so a cache shared across redraws never goes stale.
+        self.box_cache = box_cache if box_cache is not None else {}
         self.pipeline = config.get("pipeline", {})
         self.components = self.pipeline.get("components", {})
         self.budget = self.pipeline.get("budget", {}).get("limits", {})
@@ -69,67 +101,45 @@ class PipelineFlowRenderer:
             return comp.get("type", "noop"), comp.get("params", {})
         return "noop", {}
 
-    def render(self) -> Panel:
+    def _render_box(self, name: str) -> List[str]:
+        comp_type, params = self._get_component_info(name)
+        key = (name, comp_type)
+        box_lines = self.box_cache.get(key)
+        if box_lines is None:
+            box_lines = ComponentBox(name, comp_type, params).render()
+            self.box_cache[key] = box_lines
+        return box_lines
+
+    def render(self) -> "Panel":
         """Render the complete pipeline flow diagram."""
+        from rich.panel import Panel
         lines = []
 
         # Build main flow components
-        main_boxes = []
-        for comp_name in COMPONENT_ORDER:
-            comp_type, params = self._get_component_info(comp_name)
-            box = ComponentBox(comp_name, comp_type, params)
-            main_boxes.append(box.render())
+        main_boxes = [self._render_box(comp_name) for comp_name in COMPONENT_ORDER]
 
         # Build support components
-        support_boxes = []
-        for comp_name in SUPPORT_COMPONENTS:
-            comp_type, params = self._get_component_info(comp_name)
-            box = ComponentBox(comp_name, comp_type, params)
-            support_boxes.append(box.render())
+        support_boxes = [self._render_box(comp_name) for comp_name in SUPPORT_COMPONENTS]
 
-        # Render main flow (horizontal)
+        # Render main flow (horizontal), with arrows in the middle row
         box_height = 5
-        arrow = "───▶"
-
-        # Build each row of the main flow
         for row in range(box_height):
-            line_parts = []
-            for i, box_lines in enumerate(main_boxes):
-                line_parts.append(box_lines[row])
-                if i < len(main_boxes) - 1:
-                    # Add arrow in the middle row
-                    if row == 2:
-                        line_parts.append(arrow)
-                    else:
-                        line_parts.append("    ")
-            lines.append("  " + "".join(line_parts))
+            connector = "───▶" if row == 2 else "    "
+            lines.append("  " + connector.join(box_lines[row] for box_lines in main_boxes))
 
         # Add connection from reranker to estimator/scheduler
         lines.append("  " + " " * 14 + " " * 18 + "              ▲")
 
         # Render support components (scheduler and estimator)
-        # Position them below, with estimator feeding into reranker
+        # Position them below, with estimator feeding into scheduler
+        indent = "  " + " " * 18
+        scheduler_box, estimator_box = support_boxes
         for row in range(box_height):
-            scheduler_line = support_boxes[0][row]
-            estimator_line = support_boxes[1][row]
-
-            if row == 2:
-                # Arrow from estimator to scheduler
-                connector = "◀───"
-            else:
-                connector = "    "
-
-            # Position: some spacing, then scheduler, then estimator
-            line = "  " + " " * 18 + scheduler_line + connector + estimator_line
-            lines.append(line)
+            connector = "◀───" if row == 2 else "    "
+            lines.append(indent + scheduler_box[row] + connector + estimator_box[row])
 
         # Build budget line
-        budget_parts = []
-        for key, value in self.budget.items():
-            if isinstance(value, float) and value == int(value):
-                value = int(value)
-            budget_parts.append(f"{key}={value}")
-        budget_str = " | ".join(budget_parts)
+        budget_str = format_budget(self.budget)
 
         # Create the content
         content = "\n".join(lines)
@@ -143,45 +153,57 @@ class PipelineFlowRenderer:
         )
 
 
-def render_pipeline_flow(config: Dict[str, Any]) -> None:
+def render_pipeline_flow(config: Dict[str, Any], box_cache: Optional[Dict[Tuple[str, str], List[str]]] = None) -> None:
     """Display the pipeline visualization."""
-    renderer = PipelineFlowRenderer(config)
+    console = get_console()
+    renderer = PipelineFlowRenderer(config, box_cache=box_cache)
     panel = renderer.render()
     console.print(panel)
 
 
+def render_pipeline_flow_plain(config: Dict[str, Any]) -> None:
+    """Print components and budget as plain text, for piped or non-terminal output."""
+    renderer = PipelineFlowRenderer(config)
+    print(f"Pipeline: {renderer.name}")
+    for comp_name in COMPONENT_ORDER + SUPPORT_COMPONENTS:
+        comp_type, _ = renderer._get_component_info(comp_name)
+        print(f"{comp_name}: {comp_type}")
+    print(f"Budget: {format_budget(renderer.budget)}")
+
+
+@functools.lru_cache(maxsize=None)
+def _available_types(component_name: str) -> Tuple[str, ...]:
+    return tuple(registry.list_names(component_name))
+
+
 def get_available_types(component_name: str) -> List[str]:
-    """Get list of available types for a component from the registry."""
-    # Force load components
-    try:
-        import ragtune.adapters  # noqa
-        import ragtune.components  # noqa
-    except ImportError:
-        pass
+    """
+    Get list of available types for a component from the registry.
 
-    all_components = registry.list_all()
-    return list(all_components.get(component_name, {}).keys())
+    Cached per component for the session, since registrations do not change
+    while the editor is running.
+    """
+    return list(_available_types(component_name))
 
 
 def parse_value(value_str: str) -> Any:
     """Auto-detect and parse value type from string input."""
     value_str = value_str.strip()
+    lowered = value_str.lower()
 
     # Boolean
-    if value_str.lower() in ("true", "yes"):
+    if lowered in _TRUE_STRINGS:
         return True
-    if value_str.lower() in ("false", "no"):
+    if lowered in _FALSE_STRINGS:
         return False
 
     # None
-    if value_str.lower() in ("none", "null", ""):
+    if lowered in _NONE_STRINGS:
         return None
 
     # Integer
-    try:
+    if _INT_RE.fullmatch(value_str):
         return int(value_str)
-    except ValueError:
-        pass
 
     # Float
     try:
@@ -195,6 +217,8 @@ def parse_value(value_str: str) -> Any:
 
 def edit_params(component_config: Dict[str, Any]) -> None:
     """Interactive param editing for a component."""
+    from rich.prompt import Prompt
+    console = get_console()
     params = component_config.setdefault("params", {})
 
     while True:
@@ -235,6 +259,8 @@ def edit_params(component_config: Dict[str, Any]) -> None:
 
 def edit_component(config: Dict[str, Any], component_name: str) -> Dict[str, Any]:
     """Edit a single component configuration."""
+    from rich.prompt import Confirm, Prompt
+    console = get_console()
     components = config.setdefault("pipeline", {}).setdefault("components", {})
     comp = components.setdefault(component_name, {"type": "noop", "params": {}})
 
@@ -277,6 +303,8 @@ def edit_component(config: Dict[str, Any], component_name: str) -> Dict[str, Any
 
 def edit_budget(config: Dict[str, Any]) -> Dict[str, Any]:
     """Edit budget limits."""
+    from rich.prompt import Prompt
+    console = get_console()
     budget = config.setdefault("pipeline", {}).setdefault("budget", {}).setdefault("limits", {})
 
     console.print("\n[bold]Editing Budget Limits[/bold]")
@@ -319,21 +347,81 @@ def edit_budget(config: Dict[str, Any]) -> Dict[str, Any]:
     return config
 
 
-def show_diff(original: Dict[str, Any], modified: Dict[str, Any]) -> None:
-    """Display a colored unified diff between original and modified configs."""
-    original_yaml = yaml.dump(original, sort_keys=False, default_flow_style=False)
-    modified_yaml = yaml.dump(modified, sort_keys=False, default_flow_style=False)
+def _hunk_range(start: int, stop: int) -> str:
+    """Format a [start, stop) line range the way unified diff headers do."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def _fast_diff(original: List[str], modified: List[str], fromfile: str, tofile: str) -> Iterator[str]:
+    """
+    Single-pass line diff in unified format (no context lines) for small configs.
+
+    Walks both sides in step; on a mismatch it resyncs at the next original line
+    that also occurs further down in modified. Hunks are valid but not always minimal.
+    """
+    positions: Dict[str, List[int]] = {}
+    for idx, line in enumerate(modified):
+        positions.setdefault(line, []).append(idx)
+
+    hunks = []
+    i = j = 0
+    n, m = len(original), len(modified)
+    while i < n or j < m:
+        if i < n and j < m and original[i] == modified[j]:
+            i += 1
+            j += 1
+            continue
+        next_i, next_j = n, m
+        for k in range(i, n):
+            candidates = positions.get(original[k])
+            if candidates:
+                p = bisect.bisect_left(candidates, j)
+                if p < len(candidates):
+                    next_i, next_j = k, candidates[p]
+                    break
+        hunks.append((i, next_i, j, next_j))
+        i, j = next_i, next_j
+
+    if not hunks:
+        return
+    yield f"--- {fromfile}"
+    yield f"+++ {tofile}"
+    for i1, i2, j1, j2 in hunks:
+        yield f"@@ -{_hunk_range(i1, i2)} +{_hunk_range(j1, j2)} @@"
+        for line in original[i1:i2]:
+            yield "-" + line
+        for line in modified[j1:j2]:
+            yield "+" + line
+
+
+def show_diff(original: Dict[str, Any], modified: Dict[str, Any], original_yaml: Optional[str] = None) -> None:
+    """
+    Display a colored unified diff between original and modified configs.
+
+    Callers diffing against the same original repeatedly can pass its YAML dump
+    as original_yaml to avoid re-serializing it.
+    """
+    console = get_console()
+    if original_yaml is None:
+        original_yaml = yaml.dump(original, Dumper=YamlDumper, sort_keys=False, default_flow_style=False)
+    modified_yaml = yaml.dump(modified, Dumper=YamlDumper, sort_keys=False, default_flow_style=False)
 
     original_lines = original_yaml.splitlines(keepends=True)
     modified_lines = modified_yaml.splitlines(keepends=True)
 
-    diff = difflib.unified_diff(
-        original_lines,
-        modified_lines,
-        fromfile="original",
-        tofile="modified",
-        lineterm=""
-    )
+    if len(original_lines) + len(modified_lines) < FAST_DIFF_MAX_LINES:
+        diff = _fast_diff(original_lines, modified_lines, fromfile="original", tofile="modified")
+    else:
+        diff = difflib.unified_diff(
+            original_lines,
+            modified_lines,
+            fromfile="original",
+            tofile="modified",
+            lineterm=""
+        )
 
     console.print("\n[bold]Changes Preview:[/bold]")
 
@@ -359,9 +447,14 @@ def run_interactive_editor(config_path: Path, config: Dict[str, Any]) -> Optiona
     Main interactive editor loop.
 
     Returns modified config if saved, None if quit without saving.
+    The input config is never mutated; all edits go to a single deep copy.
     """
-    original = copy.deepcopy(config)
+    from rich.prompt import Confirm, Prompt
+    console = get_console()
+    original = config
     modified = copy.deepcopy(config)
+    original_yaml = yaml.dump(original, Dumper=YamlDumper, sort_keys=False, default_flow_style=False)
+    box_cache: Dict[Tuple[str, str], List[str]] = {}
 
     component_names = COMPONENT_ORDER + SUPPORT_COMPONENTS
 
@@ -389,13 +482,13 @@ def run_interactive_editor(config_path: Path, config: Dict[str, Any]) -> Optiona
             return None
 
         elif choice == "s":
-            show_diff(original, modified)
+            show_diff(original, modified, original_yaml=original_yaml)
             if Confirm.ask("\nSave these changes?", default=True):
                 return modified
             continue
 
         elif choice == "d":
-            show_diff(original, modified)
+            show_diff(original, modified, original_yaml=original_yaml)
             continue
 
         elif choice.isdigit():
@@ -404,7 +497,7 @@ def run_interactive_editor(config_path: Path, config: Dict[str, Any]) -> Optiona
                 comp_name = component_names[idx - 1]
                 modified = edit_component(modified, comp_name)
                 # Re-render the visualization
-                render_pipeline_flow(modified)
+                render_pipeline_flow(modified, box_cache=box_cache)
             elif idx == len(component_names) + 1:
                 modified = edit_budget(modified)
             else:
@@ -415,6 +508,7 @@ def run_interactive_editor(config_path: Path, config: Dict[str, Any]) -> Optiona
 
 def save_config(config: Dict[str, Any], path: Path) -> None:
     """Save configuration to YAML file."""
+    console = get_console()
     with open(path, "w") as f:
-        yaml.dump(config, f, sort_keys=False, default_flow_style=False)
+        yaml.dump(config, f, Dumper=YamlDumper, sort_keys=False, default_flow_style=False)
     console.print(f"[bold green]Saved configuration to {path}[/bold green]")
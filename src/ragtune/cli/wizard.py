@@ -1,18 +1,24 @@
-import typer
-import yaml
-from pathlib import Path
-from typing import Dict, Any, List
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm, IntPrompt, FloatPrompt
-from ragtune.registry import registry
+from typing import Dict, Any
 
-console = Console()
+# Prompt choices, built once at import
+COLLECTION_FORMATS = ("json", "jsonl", "trectext", "parquet", "txtdir", "pdfdir")
+INDEX_FRAMEWORKS = ("pyterrier", "anserini", "elasticsearch", "faiss")
+INDEX_TYPES = ("sparse", "dense", "hybrid")
+REFORMULATION_TYPES = ("llm-diverse", "llm-coverage", "keyword-expansion")
+RERANKER_TYPES = ("cross-encoder", "ollama-listwise", "colbert")
+ESTIMATOR_TYPES = ("baseline", "token_cost", "latency", "composite")
+ASSEMBLER_TYPES = ("default", "rrf", "concat")
+FEEDBACK_TYPES = ("none", "budget_stop", "quality_threshold")
 
 def run_init_wizard() -> Dict[str, Any]:
     """
     Interactive wizard to construct a RAGtune v0.2 configuration.
     """
+    from rich.panel import Panel
+    from rich.prompt import Prompt, Confirm, IntPrompt
+    from ragtune.cli.console import get_console
+    console = get_console()
+
     console.print(Panel("[bold blue]RAGtune Pipeline Wizard[/bold blue]\nLet's configure your RAG pipeline step-by-step."))
 
     # --- Group 1: Collection & Indexing ---
@@ -20,7 +26,7 @@ def run_init_wizard() -> Dict[str, Any]:
     collection_path = Prompt.ask("Path to your document collection", default="./data/bright_sample/corpus.json")
     collection_format = Prompt.ask(
         "Collection format", 
-        choices=["json", "jsonl", "trectext", "parquet", "txtdir", "pdfdir"], 
+        choices=COLLECTION_FORMATS, 
         default="json"
     )
     
@@ -32,10 +38,10 @@ def run_init_wizard() -> Dict[str, Any]:
 
     index_framework = Prompt.ask(
         "Indexing framework", 
-        choices=["pyterrier", "anserini", "elasticsearch", "faiss"], 
+        choices=INDEX_FRAMEWORKS, 
         default="pyterrier"
     )
-    index_type = Prompt.ask("Index type", choices=["sparse", "dense", "hybrid"], default="sparse")
+    index_type = Prompt.ask("Index type", choices=INDEX_TYPES, default="sparse")
     index_path = Prompt.ask("Where to save the index?", default=f"./index/{index_framework}_index")
 
     # --- Group 2: Reformulation ---
@@ -45,7 +51,7 @@ def run_init_wizard() -> Dict[str, Any]:
     if enable_reformulation:
         ref_type = Prompt.ask(
             "Reformulation type", 
-            choices=["llm-diverse", "llm-coverage", "keyword-expansion"], 
+            choices=REFORMULATION_TYPES, 
             default="llm-diverse"
         )
         if "llm" in ref_type:
@@ -68,7 +74,7 @@ def run_init_wizard() -> Dict[str, Any]:
     if enable_rerank:
         rerank_type = Prompt.ask(
             "Reranker type", 
-            choices=["cross-encoder", "ollama-listwise", "colbert"], 
+            choices=RERANKER_TYPES, 
             default="ollama-listwise"
         )
         rerank_docs = IntPrompt.ask("How many top documents to rerank?", default=10)
@@ -87,12 +93,12 @@ def run_init_wizard() -> Dict[str, Any]:
     console.print("\n[bold]Group 4: Strategy & Scoring[/bold]")
     estimator_type = Prompt.ask(
         "Estimator (Gating logic)", 
-        choices=["baseline", "token_cost", "latency", "composite"], 
+        choices=ESTIMATOR_TYPES, 
         default="baseline"
     )
     assembler_type = Prompt.ask(
         "Assembler (Result merging)", 
-        choices=["default", "rrf", "concat"], 
+        choices=ASSEMBLER_TYPES, 
         default="default"
     )
 
@@ -100,7 +106,7 @@ def run_init_wizard() -> Dict[str, Any]:
     console.print("\n[bold]Group 5: Constraints & Optimization[/bold]")
     feedback_type = Prompt.ask(
         "Feedback policy", 
-        choices=["none", "budget_stop", "quality_threshold"], 
+        choices=FEEDBACK_TYPES, 
         default="none"
     )
     
@@ -1,7 +1,10 @@
-from . import assemblers
-from . import estimators
-from . import reformulators
-from . import rerankers
-from . import retrievers
-from . import schedulers
-from . import feedback
+# Submodules are imported on first access (PEP 562). Registry lookups import the
+# module defining a component on demand, see ragtune.registry.BUILTIN_COMPONENTS.
+import importlib
+
+__all__ = ["assemblers", "estimators", "reformulators", "rerankers", "retrievers", "schedulers", "feedback"]
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
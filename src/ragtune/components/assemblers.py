@@ -1,53 +1,211 @@
-from typing import List
+import heapq
+import itertools
+from typing import TYPE_CHECKING, Dict, List
 from ragtune.core.interfaces import BaseAssembler
 from ragtune.core.types import ScoredDocument, RAGtuneContext
 from ragtune.core.pool import PoolItem
 from ragtune.registry import registry
 
+if TYPE_CHECKING:
+    import numpy as np
+
+def _estimate_tokens(item: PoolItem) -> float:
+    # Simple token estimation for v0.54
+    token_count = item.metadata.get("token_count", 0)
+    if item.content and token_count == 0:
+        token_count = item.content_tokens
+    return token_count
+
 @registry.assembler("greedy")
 class GreedyAssembler(BaseAssembler):
     """
     Greedy assembler that selects documents based on score, 
-    fitting as many as the token budget allows.
+    fitting as many as the token budget allows. When the budget cuts the
+    selection short and a single fitting document alone outscores it, that
+    document is returned instead (the Lin-Bilmes singleton fallback).
     """
     def __init__(self, min_score: float = float("-inf"), max_docs: int = 10):
         self.min_score = min_score
         self.max_docs = max_docs
 
     def assemble(self, candidates: List[PoolItem], context: RAGtuneContext) -> List[ScoredDocument]:
-        # Partition into reranked and non-reranked (candidates)
-        reranked = [it for it in candidates if it.reranker_score is not None and it.final_score() >= self.min_score]
-        non_reranked = [it for it in candidates if it.reranker_score is None and it.final_score() >= self.min_score]
-        
-        # Sort each partition
-        reranked.sort(key=lambda x: (-x.reranker_score, x.initial_rank))
-        non_reranked.sort(key=lambda x: (-x.final_score(), x.initial_rank))
-        
-        # Concatenate: Reranked always wins
-        sorted_candidates = reranked + non_reranked
-        
+        # Partition into reranked and non-reranked (candidates), decorating each item
+        # with its final score once: (-score, initial_rank, position, item). For
+        # reranked items final_score() is the reranker score. The position keeps
+        # ties stable and stops comparison from ever reaching the item itself.
+        reranked = []
+        non_reranked = []
+        for pos, it in enumerate(candidates):
+            score = it.final_score()
+            if score >= self.min_score:
+                part = reranked if it.reranker_score is not None else non_reranked
+                part.append((-score, it.initial_rank, pos, it))
+
+        # Rank each partition. At most max_docs items can be emitted, and once the
+        # token budget denies a doc every later consume is denied too, so only the
+        # top max_docs of each partition are ever needed.
+        top_reranked = heapq.nsmallest(self.max_docs, reranked)
+        top_non_reranked = heapq.nsmallest(self.max_docs, non_reranked)
+
+        tracker = context.tracker
+        limit = tracker.budget.limits.get("tokens")
+        remaining = float("inf") if limit is None else limit - tracker.consumed.get("tokens", 0.0)
+
+        # Plan the greedy pick against the budget left: Reranked always wins, and
+        # the first doc that does not fit ends the selection
+        plan = []
+        stopped_by = None
+        for entry in itertools.chain(top_reranked, top_non_reranked):
+            if len(plan) >= self.max_docs:
+                break
+            token_count = int(_estimate_tokens(entry[3]))
+            if token_count > remaining:
+                stopped_by = (entry, token_count)
+                break
+            plan.append((entry, token_count))
+            remaining -= token_count
+
+        # Lin-Bilmes fallback: when the budget cut the greedy pick short, the best
+        # single doc that fits on its own is returned instead if it alone scores
+        # higher. Scores are clamped at zero so negative ones (e.g. raw
+        # cross-encoder logits) never make a larger selection look worse.
+        if stopped_by is not None:
+            budget = remaining + sum(t for _, t in plan)
+            objective = sum(max(-entry[0], 0.0) for entry, _ in plan)
+            best = None
+            for entry in itertools.chain(reranked, non_reranked):
+                if best is None or entry[:3] < best[0][:3]:
+                    token_count = int(_estimate_tokens(entry[3]))
+                    if token_count <= budget:
+                        best = (entry, token_count)
+            if best is not None and max(-best[0][0], 0.0) > objective:
+                plan, stopped_by = [best], None
+
+        # Consume in order. The doc that stopped the plan is still offered so
+        # the denial is traced and counted, as with any over-budget request.
         result = []
-        for it in sorted_candidates:
-            if len(result) >= self.max_docs:
+        for (neg_score, _, _, it), token_count in plan + ([stopped_by] if stopped_by else []):
+            # Denied tokens still count toward the running total, so no later doc
+            # can fit once one is rejected.
+            if not tracker.try_consume_tokens(token_count):
                 break
-                
+
             # Conversion to output format
-            doc = ScoredDocument(
+            result.append(ScoredDocument(
+                id=it.doc_id,
+                content=it.content,
+                metadata=it.metadata,
+                score=-neg_score,
+                reranker_score=it.reranker_score,
+                initial_rank=it.initial_rank,
+                original_score=it.max_source_score,
+                token_count=token_count
+            ))
+        return result
+
+@registry.assembler("mmr")
+class MMRAssembler(BaseAssembler):
+    """
+    Maximal-marginal-relevance assembler. Repeatedly picks the document with the
+    highest gain alpha * sim(query, doc) - beta * max sim(doc, selected) that still
+    fits the token budget, so near-duplicates of already selected context are
+    skipped. With cost_scaled=True the gain is divided by the doc's token count,
+    and the selection falls back to the best single fitting doc when that alone
+    scores higher (Lin-Bilmes), which bounds how badly cost scaling can go wrong.
+    """
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        alpha: float = 1.0,
+        beta: float = 0.5,
+        cost_scaled: bool = False,
+        min_score: float = float("-inf"),
+        max_docs: int = 10,
+        batch_size: int = 64,
+    ):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.alpha = alpha
+        self.beta = beta
+        self.cost_scaled = cost_scaled
+        self.min_score = min_score
+        self.max_docs = max_docs
+        self.batch_size = batch_size
+        # Unit-normalized embeddings keyed by doc_id (content is fixed per doc_id).
+        self._norm_cache: Dict[str, "np.ndarray"] = {}
+
+    def _encode(self, texts: List[str]) -> "np.ndarray":
+        import numpy as np
+        return np.asarray(self.model.encode(
+            texts,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+        ), dtype=np.float32)
+
+    def _embed(self, items: List[PoolItem]) -> "np.ndarray":
+        import numpy as np
+        missing = [it for it in items if it.doc_id not in self._norm_cache]
+        if missing:
+            for it, emb in zip(missing, self._encode([it.content for it in missing])):
+                self._norm_cache[it.doc_id] = emb
+        return np.stack([self._norm_cache[it.doc_id] for it in items])
+
+    def assemble(self, candidates: List[PoolItem], context: RAGtuneContext) -> List[ScoredDocument]:
+        import numpy as np
+
+        items = [it for it in candidates if it.final_score() >= self.min_score]
+        if not items or self.max_docs <= 0:
+            return []
+
+        tracker = context.tracker
+        limit = tracker.budget.limits.get("tokens")
+        remaining = float("inf") if limit is None else limit - tracker.consumed.get("tokens", 0.0)
+
+        embs = self._embed(items)
+        rel = embs @ self._encode([context.query])[0]
+        tokens = np.array([int(_estimate_tokens(it)) for it in items], dtype=np.float64)
+        max_sim = np.zeros(len(items), dtype=np.float32)
+        available = np.ones(len(items), dtype=bool)
+
+        available &= tokens <= remaining
+        fits_alone = available.copy()
+
+        selected = []
+        objective = 0.0
+        while len(selected) < self.max_docs:
+            available &= tokens <= remaining
+            if not available.any():
+                break
+            gain = self.alpha * rel - self.beta * max_sim
+            scaled = gain / np.maximum(tokens, 1.0) if self.cost_scaled else gain
+            i = int(np.where(available, scaled, -np.inf).argmax())
+            selected.append(i)
+            objective += float(gain[i])
+            available[i] = False
+            remaining -= tokens[i]
+            np.maximum(max_sim, embs @ embs[i], out=max_sim)
+
+        if self.cost_scaled and fits_alone.any():
+            single = np.where(fits_alone, self.alpha * rel, -np.inf)
+            best = int(single.argmax())
+            if single[best] > objective:
+                selected = [best]
+
+        result = []
+        for i in selected:
+            it = items[i]
+            if not tracker.try_consume_tokens(int(tokens[i])):
+                break
+            result.append(ScoredDocument(
                 id=it.doc_id,
                 content=it.content,
                 metadata=it.metadata,
                 score=it.final_score(),
                 reranker_score=it.reranker_score,
                 initial_rank=it.initial_rank,
-                original_score=max(it.sources.values()) if it.sources else 0.0
-            )
-            
-            # Simple token estimation for v0.54
-            token_count = it.metadata.get("token_count", 0)
-            if doc.content and token_count == 0:
-                token_count = len(doc.content.split()) * 1.3
-                
-            if context.tracker.try_consume_tokens(int(token_count)):
-                doc.token_count = int(token_count)
-                result.append(doc)
+                original_score=it.max_source_score,
+                token_count=int(tokens[i])
+            ))
         return result
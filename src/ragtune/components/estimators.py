@@ -1,10 +1,17 @@
-from typing import List, Optional, Dict
-import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Dict
 from ragtune.core.types import RAGtuneContext, EstimatorOutput
 from ragtune.core.interfaces import BaseEstimator
-from ragtune.core.pool import CandidatePool, ItemState
+from ragtune.core.pool import CandidatePool, PoolItem
 from ragtune.registry import registry
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Placeholder for absent metadata keys; never equal to a real value
+_MISSING = object()
+
 @registry.estimator("baseline")
 class BaselineEstimator(BaseEstimator):
     """
@@ -13,7 +20,7 @@ class BaselineEstimator(BaseEstimator):
     def value(self, pool: CandidatePool, context: RAGtuneContext) -> Dict[str, EstimatorOutput]:
         priorities = {}
         for item in pool.get_eligible():
-            score = max(item.sources.values()) if item.sources else 0.0
+            score = item.max_source_score
             priorities[item.doc_id] = EstimatorOutput(priority=score)
         return priorities
 
@@ -25,76 +32,179 @@ class UtilityEstimator(BaseEstimator):
     """
     Predicts utility based on simple metadata overlap with already reranked winners.
     """
+    METADATA_KEYS = ("source", "section", "category")
+
     def value(self, pool: CandidatePool, context: RAGtuneContext) -> Dict[str, EstimatorOutput]:
         eligible = pool.get_eligible()
         if not eligible:
             return {}
 
-        active = pool.get_active_items()
-        winners = [it for it in active if it.state == ItemState.RERANKED and (it.reranker_score or 0) > 0.8]
+        winners = [it for it in pool.get_reranked() if (it.reranker_score or 0) > 0.8]
         
+        # A doc matches when any key is present on both it and some winner with
+        # equal values, i.e. when its value for that key is among the winners'
+        # values. The boost is applied once per doc, so it is capped at 1.2x.
+        winner_sigs = [self._signature(w) for w in winners]
+        try:
+            winner_values = [
+                {sig[k] for sig in winner_sigs if sig[k] is not _MISSING}
+                for k in range(len(self.METADATA_KEYS))
+            ]
+            matched = self._matches_by_lookup
+        except TypeError:
+            # Unhashable metadata values: compare against each winner instead
+            winner_values = winner_sigs
+            matched = self._matches_pairwise
+
         priorities = {}
         for it in eligible:
-            score = max(it.sources.values()) if it.sources else 0.0
-            if winners:
-                for winner in winners:
-                    for key in ['source', 'section', 'category']:
-                        if key in it.metadata and key in winner.metadata:
-                            if it.metadata[key] == winner.metadata[key]:
-                                score *= 1.2
-                                break
+            score = it.max_source_score
+            if winner_sigs and matched(self._signature(it), winner_values):
+                score *= 1.2
             priorities[it.doc_id] = EstimatorOutput(priority=score, predicted_quality=score)
         return priorities
 
+    @staticmethod
+    def _matches_by_lookup(sig: tuple, winner_values: List[set]) -> bool:
+        for v, values in zip(sig, winner_values):
+            if v is _MISSING:
+                continue
+            try:
+                if v in values:
+                    return True
+            except TypeError:
+                # Unhashable here while every winner value is hashable
+                continue
+        return False
+
+    @staticmethod
+    def _matches_pairwise(sig: tuple, winner_sigs: List[tuple]) -> bool:
+        return any(
+            any(a is not _MISSING and a == b for a, b in zip(sig, wsig))
+            for wsig in winner_sigs
+        )
+
+    @classmethod
+    def _signature(cls, item: PoolItem) -> tuple:
+        return tuple(item.metadata.get(key, _MISSING) for key in cls.METADATA_KEYS)
+
 @registry.estimator("similarity")
 class SimilarityEstimator(BaseEstimator):
     """
     Intelligence: Predicts utility using semantic similarity (Embeddings).
+
+    precision sets how cached embeddings are stored: "float32", "float16" (half the
+    memory) or "int8" (a quarter, scaled by 127). Similarities are always
+    accumulated in float32/int32. cache_size bounds the number of cached
+    embeddings; the least recently used are evicted first. fp16=True runs the
+    encoder itself in half precision when it is on a GPU.
     """
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    PRECISIONS = ("float32", "float16", "int8")
+    INT8_SCALE = 127
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        batch_size: int = 64,
+        precision: str = "float32",
+        cache_size: int = 10000,
+        fp16: bool = False,
+    ):
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}'. Available: {list(self.PRECISIONS)}")
         from sentence_transformers import SentenceTransformer
         self.model = SentenceTransformer(model_name)
+        # Half-precision kernels are only a win (and only well supported) on GPU
+        if fp16 and getattr(self.model.device, "type", "cpu") == "cuda":
+            self.model.half()
+        self.batch_size = batch_size
+        self.precision = precision
+        self.cache_size = cache_size
+        # Unit-normalized embeddings keyed by doc_id, in LRU order. Content is fixed
+        # per doc_id, so later iterations only encode documents not seen before.
+        self._norm_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # Reused output buffer for the per-doc max similarity, grown on demand
+        self._max_buffer: Optional["np.ndarray"] = None
+
+    def _embed(self, items: List[PoolItem]) -> "np.ndarray":
+        """Returns a (len(items), dim) matrix of unit-normalized embeddings."""
+        import numpy as np
+        cache = self._norm_cache
+        missing = [it for it in items if it.doc_id not in cache]
+        fresh: Dict[str, "np.ndarray"] = {}
+        if missing:
+            embs = np.asarray(self.model.encode(
+                [it.content for it in missing],
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            ), dtype=np.float32)
+            if self.precision == "int8":
+                embs = np.clip(np.rint(embs * self.INT8_SCALE), -self.INT8_SCALE, self.INT8_SCALE).astype(np.int8)
+            elif self.precision == "float16":
+                embs = embs.astype(np.float16)
+            fresh = {it.doc_id: emb for it, emb in zip(missing, embs)}
+
+        matrix = np.stack([fresh[it.doc_id] if it.doc_id in fresh else cache[it.doc_id] for it in items])
+
+        # Refresh recency of hits, then insert new entries and evict the oldest
+        for it in items:
+            if it.doc_id in cache:
+                cache.move_to_end(it.doc_id)
+        cache.update(fresh)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return matrix
+
+    def _similarities(self, a: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+        """Cosine similarity matrix of two embedding blocks from _embed."""
+        import numpy as np
+        dtype = np.int32 if self.precision == "int8" else np.float32
+        a, b = a.astype(dtype, copy=False), b.astype(dtype, copy=False)
+        # A single row on either side is a matrix-vector product; skip the GEMM
+        if b.shape[0] == 1:
+            sims = (a @ b[0]).reshape(-1, 1)
+        elif a.shape[0] == 1:
+            sims = (b @ a[0]).reshape(1, -1)
+        else:
+            sims = a @ b.T
+        if self.precision == "int8":
+            return sims / float(self.INT8_SCALE ** 2)
+        return sims
 
     def value(self, pool: CandidatePool, context: RAGtuneContext) -> Dict[str, EstimatorOutput]:
+        import numpy as np
+
         eligible = pool.get_eligible()
         if not eligible:
             return {}
 
-        active = pool.get_active_items()
-        reranked = [it for it in active if it.state == ItemState.RERANKED]
-        winners = [it for it in reranked if (it.reranker_score or 0) > 0.8]
-        
         priorities = {}
         for it in eligible:
-            priorities[it.doc_id] = EstimatorOutput(priority=(max(it.sources.values()) if it.sources else 0.0))
-        
+            priorities[it.doc_id] = EstimatorOutput(priority=it.max_source_score)
+
+        winners = [it for it in pool.get_reranked() if (it.reranker_score or 0) > 0.8]
         if not winners:
             return priorities
 
-        # Encode eligible and winners
-        eligible_texts = [it.content for it in eligible]
-        winner_texts = [it.content for it in winners]
-        
-        eligible_embs = self.model.encode(eligible_texts, convert_to_numpy=True)
-        winner_embs = self.model.encode(winner_texts, convert_to_numpy=True)
+        # One encode pass for both sides; cosine similarity of unit vectors is a dot product
+        embs = self._embed(eligible + winners)
+        norm_eligible, norm_winners = embs[:len(eligible)], embs[len(eligible):]
+        sims = self._similarities(norm_eligible, norm_winners)
+        buf = self._max_buffer
+        if buf is None or buf.dtype != sims.dtype or len(buf) < len(eligible):
+            buf = self._max_buffer = np.empty(max(len(eligible), 64), dtype=sims.dtype)
+        max_sims = sims.max(axis=1, out=buf[:len(eligible)])
+        sim_values = max_sims.tolist()
 
-        # Compute cosine similarity
-        eligible_norms = np.linalg.norm(eligible_embs, axis=1, keepdims=True)
-        winner_norms = np.linalg.norm(winner_embs, axis=1, keepdims=True)
-        
-        eligible_norms[eligible_norms == 0] = 1.0
-        winner_norms[winner_norms == 0] = 1.0
-        
-        norm_eligible = eligible_embs / eligible_norms
-        norm_winners = winner_embs / winner_norms
-        
-        similarities = np.dot(norm_eligible, norm_winners.T)
-        max_sims = np.max(similarities, axis=1)
-        
         boost_weight = 0.5 
-        for i, it in enumerate(eligible):
-            priorities[it.doc_id].priority *= (1.0 + max_sims[i] * boost_weight)
-            priorities[it.doc_id].predicted_quality = max_sims[i]
+        max_sims *= boost_weight
+        max_sims += 1.0
+        for it, sim, boost in zip(eligible, sim_values, max_sims.tolist()):
+            out = priorities[it.doc_id]
+            out.priority *= boost
+            out.predicted_quality = sim
 
         return priorities
 
@@ -105,7 +215,8 @@ class ReformIREstimator(BaseEstimator):
 
     After cross-encoder feedback accumulates, learns optimal combination weights
     for each retrieval source (original query + each reformulation) via constrained
-    linear regression (scipy.optimize.lsq_linear), using cross-encoder scores as
+    linear regression (closed-form least squares, or scipy.optimize.lsq_linear
+    when that optimum falls outside [0, 1]), using cross-encoder scores as
     the supervision signal. Applies the learned weights to re-prioritize remaining
     CANDIDATE items each iteration.
 
@@ -115,39 +226,53 @@ class ReformIREstimator(BaseEstimator):
     def __init__(self, min_reranked_for_regression: int = 3):
         self.min_reranked_for_regression = min_reranked_for_regression
         self._learned_weights: Optional[Dict[str, float]] = None
+        # Last regression inputs (sources, X, y) and their solution; the solve is
+        # skipped when nothing new was reranked since the previous call.
+        self._last_fit: Optional[tuple] = None
 
     def value(self, pool: CandidatePool, context: RAGtuneContext) -> Dict[str, EstimatorOutput]:
+        import numpy as np
         import scipy.optimize
 
-        reranked = [it for it in pool.get_active_items() if it.state == ItemState.RERANKED]
+        reranked = pool.get_reranked()
         eligible = pool.get_eligible()
 
         if len(reranked) < self.min_reranked_for_regression:
             # Not enough cross-encoder feedback yet — use raw retrieval score
             return {
-                it.doc_id: EstimatorOutput(priority=max(it.sources.values()) if it.sources else 0.0)
+                it.doc_id: EstimatorOutput(priority=it.max_source_score)
                 for it in eligible
             }
 
         # Build feature matrix: rows = reranked items, cols = retrieval sources
-        all_sources = sorted({k for it in reranked for k in it.sources})
-        X = np.array([[it.sources.get(s, 0.0) for s in all_sources] for it in reranked])
+        all_sources, X = pool.source_matrix(reranked)
         y = np.array([it.reranker_score or 0.0 for it in reranked])
 
         # Constrained least-squares: weights in [0, 1]
-        result = scipy.optimize.lsq_linear(X, y, bounds=(0, 1))
-        self._learned_weights = dict(zip(all_sources, result.x))
+        last = self._last_fit
+        if last is not None and last[0] == all_sources and np.array_equal(last[1], X) and np.array_equal(last[2], y):
+            weights = last[3]
+        else:
+            # The unconstrained optimum is usually already inside the box, in which
+            # case it is also the constrained one; only solve iteratively otherwise.
+            weights = np.linalg.lstsq(X, y, rcond=None)[0]
+            if not ((weights >= 0.0) & (weights <= 1.0)).all():
+                weights = scipy.optimize.lsq_linear(X, y, bounds=(0, 1)).x
+            self._last_fit = (all_sources, X, y, weights)
+        self._learned_weights = dict(zip(all_sources, weights))
 
         context.tracker.trace.add(
             "estimator", "reformir_weights_updated",
             weights=self._learned_weights, n_reranked=len(reranked),
         )
 
-        # Score remaining candidates using learned weights; store weights in metadata
-        # so the controller can pass them to ReformIRConvergenceFeedback.
+        # Score remaining candidates using learned weights (sources never seen on a
+        # reranked item weigh 0.0); store weights in metadata so the controller can
+        # pass them to ReformIRConvergenceFeedback.
+        _, S = pool.source_matrix(eligible, all_sources)
+        scores = (S @ weights).tolist()
         priorities = {}
-        for it in eligible:
-            score = sum(self._learned_weights.get(s, 0.0) * v for s, v in it.sources.items())
+        for it, score in zip(eligible, scores):
             priorities[it.doc_id] = EstimatorOutput(
                 priority=score,
                 predicted_quality=score,
@@ -158,25 +283,66 @@ class ReformIREstimator(BaseEstimator):
 
 @registry.estimator("composite")
 class CompositeEstimator(BaseEstimator):
-    """Combines multiple estimators with weighted or logical aggregation."""
-    def __init__(self, estimators: List[BaseEstimator], weights: Optional[List[float]] = None, mode: str = "any"):
+    """
+    Combines multiple estimators with weighted or logical aggregation.
+
+    Members run one after another by default. With parallel=True they run
+    concurrently on a thread pool owned by the composite; embedding and
+    model-backed estimators spend most of their time in native code that
+    releases the GIL. Only enable it for members that are safe to call from
+    several threads at once, and note that their trace events then interleave.
+    """
+    def __init__(self, estimators: List[BaseEstimator], weights: Optional[List[float]] = None, mode: str = "any", parallel: bool = False):
         self.estimators = estimators
         self.weights = weights or [1.0] * len(estimators)
         self.mode = mode # "any" or "all" for needs_reformulation
+        self.parallel = parallel
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def value(self, pool: CandidatePool, context: RAGtuneContext) -> Dict[str, EstimatorOutput]:
-        combined_priorities = {}
-        for est, weight in zip(self.estimators, self.weights):
-            outputs = est.value(pool, context)
+        import numpy as np
+
+        members = list(zip(self.estimators, self.weights))
+        if self.parallel and len(members) > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(members))
+            # map() yields results in member order regardless of completion order
+            outputs_list = list(self._executor.map(lambda m: m[0].value(pool, context), members))
+        else:
+            outputs_list = [est.value(pool, context) for est, _ in members]
+
+        # Single pass per estimator output: assign each doc_id a row in first-seen
+        # order (one hash lookup per doc) and gather its priority and quality.
+        # The weighted sums are then applied as one vectorized update per estimator.
+        index: Dict[str, int] = {}
+        gathered = []
+        for outputs, (_, weight) in zip(outputs_list, members):
+            rows, scores, q_rows, q_vals = [], [], [], []
             for doc_id, out in outputs.items():
-                if doc_id not in combined_priorities:
-                    combined_priorities[doc_id] = EstimatorOutput(priority=0.0)
-                combined_priorities[doc_id].priority += (out.priority * weight)
-                # Average other metrics if they exist
+                row = index.setdefault(doc_id, len(index))
+                rows.append(row)
+                scores.append(out.priority)
                 if out.predicted_quality is not None:
-                    curr_q = combined_priorities[doc_id].predicted_quality or 0.0
-                    combined_priorities[doc_id].predicted_quality = curr_q + out.predicted_quality / len(self.estimators)
-        return combined_priorities
+                    q_rows.append(row)
+                    q_vals.append(out.predicted_quality)
+            gathered.append((weight, rows, scores, q_rows, q_vals))
+
+        n_est = len(self.estimators)
+        priority = np.zeros(len(index))
+        quality = np.zeros(len(index))
+        has_quality = np.zeros(len(index), dtype=bool)
+        for weight, rows, scores, q_rows, q_vals in gathered:
+            if rows:
+                priority[rows] += np.asarray(scores, dtype=np.float64) * weight
+            # Average other metrics if they exist
+            if q_rows:
+                quality[q_rows] += np.asarray(q_vals, dtype=np.float64) / n_est
+                has_quality[q_rows] = True
+
+        return {
+            doc_id: EstimatorOutput(priority=p, predicted_quality=q if rated else None)
+            for doc_id, p, q, rated in zip(index, priority.tolist(), quality.tolist(), has_quality.tolist())
+        }
 
     def needs_reformulation(self, context: RAGtuneContext, current_pool: CandidatePool) -> bool:
         results = [est.needs_reformulation(context, current_pool) for est in self.estimators]
@@ -31,19 +31,31 @@ class ReformIRConvergenceFeedback(BaseFeedback):
     def __init__(self, convergence_threshold: float = 0.01):
         self.convergence_threshold = convergence_threshold
         self._prev_weights: Optional[Dict[str, float]] = None
+        # Previous weights as (source names, values) for an array-wise delta
+        self._prev_array: Optional[Tuple[tuple, Any]] = None
 
     def should_stop(self, metrics: Dict[str, Any], budget: Any, estimates: Dict[str, Any]) -> Tuple[bool, str]:
+        import numpy as np
+
         current_weights = estimates.get("reformir_weights")
+        current_array = None
+        if current_weights is not None:
+            current_array = (tuple(current_weights), np.fromiter(current_weights.values(), dtype=np.float64, count=len(current_weights)))
+
         if current_weights is None or self._prev_weights is None:
-            self._prev_weights = current_weights
+            self._prev_weights, self._prev_array = current_weights, current_array
             return False, ""
 
-        all_keys = set(current_weights) | set(self._prev_weights)
-        delta = max(
-            abs(current_weights.get(k, 0.0) - self._prev_weights.get(k, 0.0))
-            for k in all_keys
-        )
-        self._prev_weights = current_weights
+        if current_array[0] == self._prev_array[0]:
+            # Same sources in the same order (the estimator sorts them)
+            delta = float(np.abs(current_array[1] - self._prev_array[1]).max())
+        else:
+            all_keys = set(current_weights) | set(self._prev_weights)
+            delta = max(
+                abs(current_weights.get(k, 0.0) - self._prev_weights.get(k, 0.0))
+                for k in all_keys
+            )
+        self._prev_weights, self._prev_array = current_weights, current_array
 
         if delta < self.convergence_threshold:
             return True, f"ReformIR weights converged (max_delta={delta:.4f})"
@@ -1,9 +1,41 @@
+import json
+import re
+from difflib import SequenceMatcher
 from typing import List, Optional
 from ragtune.core.interfaces import BaseReformulator
 from ragtune.core.types import RAGtuneContext
 from ragtune.registry import registry
 from ragtune.utils.config import config
 
+# Patterns used to pull a JSON payload out of an LLM response
+_JSON_FENCE_RE = re.compile(r"```json\s*")
+_FENCE_RE = re.compile(r"```\s*")
+_LIST_RE = re.compile(r"(\[.*\])", re.DOTALL)
+_OBJECT_RE = re.compile(r"(\{.*\})", re.DOTALL)
+# Characters that matter when matching brackets; escapes are consumed as a unit
+_JSON_STRUCTURE_RE = re.compile(r'\\.|["\[\]{}]', re.DOTALL)
+
+def _extract_json_span(text: str, start: int) -> Optional[str]:
+    """
+    Returns the bracketed value opening at text[start] up to its matching closer,
+    skipping brackets inside string literals, or None if it is never closed.
+    """
+    depth = 0
+    in_string = False
+    for match in _JSON_STRUCTURE_RE.finditer(text, start):
+        token = match.group()
+        if token == '"':
+            in_string = not in_string
+        elif in_string or len(token) > 1:
+            continue
+        elif token in "[{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return text[start:match.end()]
+    return None
+
 @registry.reformulator("identity")
 class IdentityReformulator(BaseReformulator):
     """Pass-through reformulator that returns the original query."""
@@ -56,23 +88,27 @@ class LLMReformulator(BaseReformulator):
             return []
 
     def _parse_response(self, content: str) -> List[str]:
-        import json
-        import re
-        
         # 1. Strip code fences
-        content = re.sub(r"```json\s*", "", content)
-        content = re.sub(r"```\s*", "", content)
+        content = _JSON_FENCE_RE.sub("", content)
+        content = _FENCE_RE.sub("", content)
         content = content.strip()
         
-        # 2. Try to find a JSON-like structure [...] if it's wrapped in text
+        # 2. Try to find a JSON-like structure [...] if it's wrapped in text: take the
+        # balanced span from the first opener, else first opener to last closer
         if not content.startswith("[") and "[" in content:
-            match = re.search(r"(\[.*\])", content, re.DOTALL)
-            if match:
-                content = match.group(1)
+            span = _extract_json_span(content, content.index("["))
+            if span is None:
+                match = _LIST_RE.search(content)
+                span = match.group(1) if match else None
+            if span is not None:
+                content = span
         elif not content.startswith("{") and "{" in content:
-            match = re.search(r"(\{.*\})", content, re.DOTALL)
-            if match:
-                content = match.group(1)
+            span = _extract_json_span(content, content.index("{"))
+            if span is None:
+                match = _OBJECT_RE.search(content)
+                span = match.group(1) if match else None
+            if span is not None:
+                content = span
         
         try:
             data = json.loads(content)
@@ -99,10 +135,11 @@ class LLMReformulator(BaseReformulator):
 
     # Exposed for subclasses
     def _filter_queries(self, queries: List[str], original_query: str, m: int) -> List[str]:
-        from difflib import SequenceMatcher
-        
         threshold = config.get("retrieval.near_duplicate_threshold", 0.8)
         filtered = []
+        # One matcher per accepted query, holding it as seq2 so its index (b2j)
+        # is built once rather than for every later comparison.
+        matchers = []
         original_norm = original_query.lower().strip()
         
         for q in queries:
@@ -116,15 +153,21 @@ class LLMReformulator(BaseReformulator):
             if q_norm == original_norm:
                 continue
             
-            # Near-duplicate filtering
+            # Near-duplicate filtering. The cheap upper bounds (length-only, then
+            # character multiset) rule out most pairs before the full ratio() runs,
+            # as in difflib.get_close_matches.
             is_duplicate = False
-            for existing in filtered:
-                if SequenceMatcher(None, q_norm, existing.lower()).ratio() > threshold:
+            for matcher in matchers:
+                matcher.set_seq1(q_norm)
+                if (matcher.real_quick_ratio() > threshold
+                        and matcher.quick_ratio() > threshold
+                        and matcher.ratio() > threshold):
                     is_duplicate = True
                     break
             
             if not is_duplicate:
                 filtered.append(q_clean)
+                matchers.append(SequenceMatcher(None, "", q_norm))
                 
             if len(filtered) >= m:
                 break
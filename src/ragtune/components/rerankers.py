@@ -1,10 +1,143 @@
-from typing import List, Dict, Optional, Any
+import json
+import re
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Tuple
 from ragtune.core.pool import PoolItem
 from ragtune.core.types import RAGtuneContext
 from ragtune.core.interfaces import BaseReranker
 from ragtune.registry import registry
 from ragtune.utils.config import config
 
+# Body of the first ```json fence in an LLM response, up to the closing fence
+_JSON_FENCE_RE = re.compile(r"```json(.*?)(?:```|$)", re.S)
+_DECODER = json.JSONDecoder()
+
+
+def _decode_json_payload(content: str) -> Any:
+    """
+    Decodes the JSON value in an LLM response, taken from inside a ```json
+    fence when there is one. Parses in place from the value's offset, without
+    slicing or stripping the response; text after the value is ignored.
+    """
+    start = 0
+    match = _JSON_FENCE_RE.search(content)
+    if match:
+        start = match.start(1)
+    while start < len(content) and content[start].isspace():
+        start += 1
+    return _DECODER.raw_decode(content, start)[0]
+
+
+# LiteLLM exceptions worth scoring around: the call may well succeed on retry.
+# Anything else (auth, bad request, unknown model) is a configuration problem.
+_TRANSIENT_LLM_ERRORS = (
+    "RateLimitError",
+    "Timeout",
+    "APIConnectionError",
+    "ServiceUnavailableError",
+    "InternalServerError",
+    "BadGatewayError",
+)
+
+
+def _transient_errors(litellm: Any) -> Tuple[type, ...]:
+    """The exception classes in _TRANSIENT_LLM_ERRORS that this litellm defines."""
+    errors = (getattr(litellm, name, None) for name in _TRANSIENT_LLM_ERRORS)
+    return tuple(e for e in errors if isinstance(e, type) and issubclass(e, BaseException))
+
+
+def _listwise_documents(documents: List[PoolItem]) -> str:
+    """Formats the document block of a listwise ranking prompt."""
+    return "".join(
+        f"Document ID: {doc.doc_id}\nContent: {doc.content[:500]}\n---\n" for doc in documents
+    )
+
+
+def _listwise_prompts() -> Tuple[str, str]:
+    """Returns (system_prompt, user_template) for listwise ranking."""
+    prompts = config.get_prompt("reranking.listwise_ranking")
+    if not prompts:
+        # Fallback to hardcoded defaults or raise error
+        return (
+            "You are a helpful assistant that ranks documents by relevance.",
+            "Rank these documents for query '{query}':\n{documents}",
+        )
+    return (
+        prompts.get("system", "You are a helpful assistant that ranks documents by relevance."),
+        prompts.get("user", ""),
+    )
+
+
+def _unique_content(documents: List[PoolItem], key=lambda doc: doc.content) -> Tuple[List[PoolItem], Dict[str, str]]:
+    """
+    Returns the first document for each distinct key(doc), in order, and a map
+    from every doc_id to the doc_id of the representative sharing its key.
+    """
+    first: Dict[Any, PoolItem] = {}
+    rep_of = {}
+    for doc in documents:
+        rep = first.setdefault(key(doc), doc)
+        rep_of[doc.doc_id] = rep.doc_id
+    return list(first.values()), rep_of
+
+
+def _parse_rankings(data: Any) -> Dict[str, float]:
+    """Maps doc_id -> score from a decoded listwise response."""
+    if not data:
+        rankings = []
+    elif isinstance(data, list):
+        rankings = data
+    else:
+        rankings = data.get("rankings") or data.get("scores") or []
+
+    score_map = {}
+    for item in rankings:
+        if isinstance(item, dict):
+            doc_id = str(item.get("doc_id") or item.get("id", ""))
+            if doc_id:
+                score_map[doc_id] = float(item.get("relevance_score") or item.get("score", 0.0))
+        elif isinstance(item, str):
+            # Fallback for list of IDs
+            score_map[item] = 1.0 # Or some default rank-based score
+    return score_map
+
+
+class _ScoreCache:
+    """
+    LRU map of (query, doc_id, content) -> score for model-backed rerankers.
+
+    Reranking is deterministic for a given model, so repeated (query, document)
+    pairs, e.g. across a parameter sweep, are scored once. size=0 disables it.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self._scores: "OrderedDict[tuple, float]" = OrderedDict()
+
+    def lookup(self, query: str, documents: List[PoolItem]) -> Dict[str, float]:
+        """Returns {doc_id: score} for the cached documents."""
+        hits = {}
+        if not self.size:
+            return hits
+        for doc in documents:
+            key = (query, doc.doc_id, doc.content)
+            if key in self._scores:
+                self._scores.move_to_end(key)
+                hits[doc.doc_id] = self._scores[key]
+        return hits
+
+    def store(self, query: str, documents: List[PoolItem], scores: Dict[str, float]) -> None:
+        if not self.size:
+            return
+        for doc in documents:
+            if doc.doc_id in scores:
+                self._scores[(query, doc.doc_id, doc.content)] = scores[doc.doc_id]
+        while len(self._scores) > self.size:
+            self._scores.popitem(last=False)
+
+
 @registry.reranker("noop")
 class NoOpReranker(BaseReranker):
     """Identity reranker that returns documents as is."""
@@ -13,67 +146,319 @@ class NoOpReranker(BaseReranker):
 
 @registry.reranker("cross-encoder")
 class CrossEncoderReranker(BaseReranker):
-    """Local reranking using SentenceTransformers CrossEncoder models."""
-    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"):
+    """
+    Local reranking using SentenceTransformers CrossEncoder models.
+
+    All (query, document) pairs go to a single predict() call, batched by
+    batch_size. Inputs are truncated to max_length tokens (default: the
+    model's own limit). Setting max_chars also clips document text before
+    tokenization so very long documents don't dominate tokenizer time; both
+    change the scores of long documents, so neither is on by default.
+
+    backend selects the inference runtime ("torch", "onnx" or "openvino"; the
+    latter two need the sentence-transformers extras and typically run 2-4x
+    faster on CPU). model_kwargs is passed through to the backend, e.g.
+    {"file_name": "onnx/model_O4.onnx"}. If a non-torch backend cannot be
+    loaded the model falls back to torch; self.backend records which one is in
+    use. fp16=True halves the torch model when it runs on a GPU.
+
+    quantize ("arm64", "avx2", "avx512" or "avx512_vnni") runs an int8
+    dynamically quantized ONNX export of the model on CPU. The export is made
+    once per model and instruction set under quantize_cache and reused by later
+    processes; it needs optimum and onnxruntime, and falls back like backend.
+
+    Scores are cached per (query, document) for up to cache_size pairs, so
+    only uncached documents reach the model.
+    """
+    BACKENDS = ("torch", "onnx", "openvino")
+    QUANTIZATIONS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        batch_size: int = 32,
+        max_length: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        backend: str = "torch",
+        device: Optional[str] = None,
+        fp16: bool = False,
+        model_kwargs: Optional[Dict[str, Any]] = None,
+        quantize: Optional[str] = None,
+        quantize_cache: str = "~/.cache/ragtune/quantized",
+        cache_size: int = 10000,
+    ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Available: {list(self.BACKENDS)}")
+        if quantize is not None and quantize not in self.QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantize}'. Available: {list(self.QUANTIZATIONS)}")
         from sentence_transformers import CrossEncoder
-        self.model = CrossEncoder(model_name)
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.max_chars = max_chars
+        self.backend = backend
+        self.quantize = quantize
+        self._cache = _ScoreCache(cache_size)
+        self.model = None
+        if quantize:
+            try:
+                self.model = self._load_quantized(model_name, max_length, quantize, Path(quantize_cache).expanduser())
+                self.backend = "onnx"
+            except Exception:
+                self.quantize = None
+        if self.model is None:
+            # backend/model_kwargs only exist in sentence-transformers >= 3.2, so
+            # they are forwarded only when set and older installs keep working
+            load_kwargs: Dict[str, Any] = {}
+            if backend != "torch":
+                load_kwargs["backend"] = backend
+            if model_kwargs:
+                load_kwargs["model_kwargs"] = model_kwargs
+            try:
+                self.model = CrossEncoder(model_name, max_length=max_length, device=device, **load_kwargs)
+            except Exception:
+                if backend == "torch":
+                    raise
+                # Missing runtime or exported weights: keep working on the default backend
+                self.backend = "torch"
+                self.model = CrossEncoder(model_name, max_length=max_length, device=device)
+        if fp16 and self.backend == "torch" and getattr(self.model.device, "type", "cpu") == "cuda":
+            self.model.half()
+
+    @staticmethod
+    def _load_quantized(model_name: str, max_length: Optional[int], quantize: str, cache_root: Path):
+        """Loads the int8 ONNX export for quantize, creating it on first use."""
+        from sentence_transformers import CrossEncoder
+        from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+        local_dir = cache_root / model_name.replace("/", "__")
+        file_name = f"onnx/model_qint8_{quantize}.onnx"
+        if not (local_dir / file_name).exists():
+            model = CrossEncoder(model_name, max_length=max_length, backend="onnx")
+            model.save(str(local_dir))
+            export_dynamic_quantized_onnx_model(model, quantize, str(local_dir))
+        return CrossEncoder(
+            str(local_dir), max_length=max_length, device="cpu", backend="onnx", model_kwargs={"file_name": file_name}
+        )
 
     def rerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
         if not documents:
             return {}
             
-        pairs = [[context.query, doc.content] for doc in documents]
-        scores = self.model.predict(pairs)
+        scores = self._cache.lookup(context.query, documents)
+        missing = [doc for doc in documents if doc.doc_id not in scores]
+        if missing:
+            # Documents whose clipped text is identical are scored once
+            unique, rep_of = _unique_content(missing, key=lambda doc: doc.content[:self.max_chars])
+            pairs = [[context.query, doc.content[:self.max_chars]] for doc in unique]
+            predicted = self.model.predict(
+                pairs,
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+            # One tolist() converts the whole array to Python floats
+            by_rep = dict(zip([doc.doc_id for doc in unique], predicted.tolist()))
+            fresh = {doc.doc_id: by_rep[rep_of[doc.doc_id]] for doc in missing}
+            self._cache.store(context.query, missing, fresh)
+            scores.update(fresh)
         
-        return {doc.doc_id: float(score) for doc, score in zip(documents, scores)}
+        return {doc.doc_id: scores[doc.doc_id] for doc in documents}
 
 @registry.reranker("llm")
 class LLMReranker(BaseReranker):
-    """API-based reranking using LiteLLM for broad model support."""
-    def __init__(self, model_name: str = "gpt-4o-mini"):
+    """
+    API-based reranking using LiteLLM for broad model support.
+
+    By default documents are scored pointwise, one completion per document.
+    With listwise_window > 1 they are ranked listwise instead, one completion
+    per window of that many documents, which cuts API calls and prompt
+    overhead by about that factor; a trailing window of one document is
+    scored pointwise. The calls are independent and I/O-bound: rerank() runs
+    up to max_workers of them on a thread pool, arerank() issues them all at
+    once with asyncio.gather. Successful scores are cached per (query,
+    document) for up to cache_size pairs.
+
+    A call that fails transiently (rate limit, timeout, connection or server
+    error) scores its documents 0.0, is recorded in the trace, and is retried
+    next time. Any other error, or every call failing, is raised so the
+    controller drops the batch.
+    """
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        max_workers: int = 8,
+        cache_size: int = 10000,
+        listwise_window: int = 1,
+    ):
         import litellm
         self.model = model_name
+        self.max_workers = max_workers
+        self.listwise_window = max(1, listwise_window)
+        self._cache = _ScoreCache(cache_size)
+        # (system_prompt, user_template) pairs, read from config on first use
+        self._pointwise_prompts: Optional[Tuple[str, str]] = None
+        self._listwise_prompts: Optional[Tuple[str, str]] = None
 
     def rerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
         if not documents:
             return {}
-            
-        import litellm
-        
-        prompts = config.get("prompts.reranking.pointwise")
-        system_prompt = prompts.get("system")
-        user_prompt_template = prompts.get("user")
-        
-        scores = {}
-        for doc in documents:
-            user_prompt = user_prompt_template.format(query=context.query, document=doc.content)
-            
-            response = litellm.completion(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"}
+
+        scores, batch = self._prepare(documents, context)
+        if batch is not None:
+            # Resolved once per call, not once per request on the worker threads
+            import litellm
+            completion = litellm.completion
+            transient = _transient_errors(litellm)
+
+            def call(messages: List[Dict[str, str]]) -> Any:
+                try:
+                    return completion(
+                        model=self.model,
+                        messages=messages,
+                        response_format={"type": "json_object"}
+                    )
+                except transient as e:
+                    return e
+
+            requests = batch[3]
+            workers = max(1, min(self.max_workers, len(requests)))
+            if workers == 1:
+                responses = [call(messages) for messages in requests]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    responses = list(executor.map(call, requests))
+            self._record(context, batch, responses, scores)
+
+        return {doc.doc_id: scores[doc.doc_id] for doc in documents}
+
+    async def arerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
+        if not documents:
+            return {}
+
+        scores, batch = self._prepare(documents, context)
+        if batch is not None:
+            import litellm
+            acompletion = litellm.acompletion
+            transient = _transient_errors(litellm)
+
+            async def call(messages: List[Dict[str, str]]) -> Any:
+                try:
+                    return await acompletion(
+                        model=self.model,
+                        messages=messages,
+                        response_format={"type": "json_object"}
+                    )
+                except transient as e:
+                    return e
+
+            responses = await asyncio.gather(*(call(messages) for messages in batch[3]))
+            self._record(context, batch, responses, scores)
+
+        return {doc.doc_id: scores[doc.doc_id] for doc in documents}
+
+    def _prepare(self, documents: List[PoolItem], context: RAGtuneContext) -> Tuple[Dict[str, float], Optional[tuple]]:
+        """
+        Returns (cached scores, batch), where batch is None when everything was
+        cached and otherwise (missing, rep_of, windows, requests): the uncached
+        documents, their content representatives, the windows of
+        representatives and one chat request per window.
+        """
+        scores = self._cache.lookup(context.query, documents)
+        missing = [doc for doc in documents if doc.doc_id not in scores]
+        if not missing:
+            return scores, None
+        # Documents with identical content are scored once
+        unique, rep_of = _unique_content(missing)
+        windows = self._windows(unique)
+        return scores, (missing, rep_of, windows, self._requests(windows, context.query))
+
+    def _windows(self, documents: List[PoolItem]) -> List[List[PoolItem]]:
+        size = self.listwise_window
+        return [documents[i:i + size] for i in range(0, len(documents), size)]
+
+    def _requests(self, windows: List[List[PoolItem]], query: str) -> List[List[Dict[str, str]]]:
+        """Builds the chat messages for each window: pointwise for one document, listwise otherwise."""
+        requests = []
+        for window in windows:
+            if len(window) == 1:
+                if self._pointwise_prompts is None:
+                    prompts = config.get("prompts.reranking.pointwise")
+                    self._pointwise_prompts = (prompts.get("system"), prompts.get("user"))
+                system_prompt, user_template = self._pointwise_prompts
+                user_prompt = user_template.format(query=query, document=window[0].content)
+            else:
+                if self._listwise_prompts is None:
+                    self._listwise_prompts = _listwise_prompts()
+                system_prompt, user_template = self._listwise_prompts
+                user_prompt = user_template.format(query=query, documents=_listwise_documents(window))
+            requests.append([
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ])
+        return requests
+
+    def _record(self, context: RAGtuneContext, batch: tuple, responses: List[Any], scores: Dict[str, float]) -> None:
+        """
+        Parses each window's response for a batch from _prepare and gives every
+        document its representative's result: fills scores, with 0.0 for
+        failures, and caches the successes. Raises the first error if no call
+        succeeded.
+        """
+        documents, rep_of, windows, _ = batch
+        errors = [r for r in responses if isinstance(r, BaseException)]
+        if errors:
+            if len(errors) == len(responses):
+                raise errors[0]
+            context.tracker.trace.add(
+                "reranker", "llm_partial_failure",
+                failed=len(errors), calls=len(responses), error=str(errors[0]), model=self.model,
             )
-            
-            try:
-                import json
-                result = json.loads(response.choices[0].message.content)
-                score = float(result.get("relevance_score", 0.0))
-                scores[doc.doc_id] = score
-            except (ValueError, KeyError, AttributeError):
-                scores[doc.doc_id] = 0.0
-                
-        return scores
+
+        results: Dict[str, Optional[float]] = {}
+        for window, response in zip(windows, responses):
+            if len(window) == 1:
+                parsed = [self._parse_score(response)]
+            else:
+                parsed = self._parse_window(window, response)
+            results.update(zip([doc.doc_id for doc in window], parsed))
+
+        fresh = {}
+        for doc in documents:
+            r = results[rep_of[doc.doc_id]]
+            scores[doc.doc_id] = 0.0 if r is None else r
+            if r is not None:
+                fresh[doc.doc_id] = r
+        self._cache.store(context.query, documents, fresh)
+
+    @staticmethod
+    def _parse_score(response: Any) -> Optional[float]:
+        if isinstance(response, BaseException):
+            return None
+        try:
+            result = json.loads(response.choices[0].message.content)
+            return float(result.get("relevance_score", 0.0))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _parse_window(window: List[PoolItem], response: Any) -> List[Optional[float]]:
+        """Per-document scores from a listwise response; documents it omits score 0.0."""
+        if isinstance(response, BaseException):
+            return [None] * len(window)
+        try:
+            score_map = _parse_rankings(_decode_json_payload(response.choices[0].message.content))
+        except Exception:
+            return [None] * len(window)
+        return [score_map.get(doc.doc_id, 0.0) for doc in window]
 
 @registry.reranker("simulated")
 class SimulatedReranker(BaseReranker):
     """Placeholder for testing."""
     def rerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
         scores = {}
+        q = context.query.lower()
         for doc in documents:
-            is_match = context.query.lower() in doc.content.lower()
+            is_match = q in doc.content.lower()
             reranker_score = 0.95 if is_match else 0.3
             scores[doc.doc_id] = reranker_score
         return scores
@@ -84,6 +469,8 @@ class OllamaListwiseReranker(BaseReranker):
     def __init__(self, model_name: str = "deepseek-r1:8b", base_url: str = "http://localhost:11434"):
         self.model_name = f"ollama/{model_name}"
         self.api_base = base_url
+        # (system_prompt, user_template), read from config on first use
+        self._prompts: Optional[Tuple[str, str]] = None
 
     def rerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
         if not documents:
@@ -91,22 +478,11 @@ class OllamaListwiseReranker(BaseReranker):
             
         try:
             import litellm
-            import json
             
-            prompts = config.get_prompt("reranking.listwise_ranking")
-            if not prompts:
-                # Fallback to hardcoded defaults or raise error
-                sys_prompt = "You are a helpful assistant that ranks documents by relevance."
-                user_template = "Rank these documents for query '{query}':\n{documents}"
-            else:
-                sys_prompt = prompts.get("system", "You are a helpful assistant that ranks documents by relevance.")
-                user_template = prompts.get("user", "")
-
-            doc_list = ""
-            for doc in documents:
-                doc_list += f"Document ID: {doc.doc_id}\nContent: {doc.content[:500]}\n---\n"
-                
-            user_prompt = user_template.format(query=context.query, documents=doc_list)
+            if self._prompts is None:
+                self._prompts = _listwise_prompts()
+            sys_prompt, user_template = self._prompts
+            user_prompt = user_template.format(query=context.query, documents=_listwise_documents(documents))
             
             response = litellm.completion(
                 model=self.model_name,
@@ -118,28 +494,7 @@ class OllamaListwiseReranker(BaseReranker):
                 response_format={"type": "json_object"}
             )
             
-            content = response.choices[0].message.content
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            
-            data = json.loads(content)
-            if not data:
-                rankings = []
-            elif isinstance(data, list):
-                rankings = data
-            else:
-                rankings = data.get("rankings") or data.get("scores") or []
-            
-            score_map = {}
-            for item in rankings:
-                if isinstance(item, dict):
-                    doc_id = str(item.get("doc_id") or item.get("id", ""))
-                    if doc_id:
-                        score_map[doc_id] = float(item.get("relevance_score") or item.get("score", 0.0))
-                elif isinstance(item, str):
-                    # Fallback for list of IDs
-                    score_map[item] = 1.0 # Or some default rank-based score
-            
+            score_map = _parse_rankings(_decode_json_payload(response.choices[0].message.content))
             return {doc.doc_id: score_map.get(doc.doc_id, 0.0) for doc in documents}
             
         except Exception as e:
@@ -179,13 +534,29 @@ class MonoT5Reranker(BaseReranker):
 
 @registry.reranker("multi-strategy")
 class MultiStrategyReranker(BaseReranker):
-    """Router for multiple reranking strategies."""
+    """
+    Router for multiple reranking strategies.
+
+    Each strategy's rerank/arerank is bound once at construction, so routing a
+    batch is a single dict lookup. Unknown or missing strategies go to
+    default_strategy; if that isn't configured either, every document scores 0.0.
+    """
     def __init__(self, strategies: Dict[str, BaseReranker], default_strategy: Optional[str] = None):
         self.strategies = strategies
         self.default_strategy = default_strategy or "identity"
+        self._dispatch = {name: r.rerank for name, r in strategies.items()}
+        self._adispatch = {name: r.arerank for name, r in strategies.items()}
+        self._default = self._dispatch.get(self.default_strategy)
+        self._adefault = self._adispatch.get(self.default_strategy)
 
     def rerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
-        effective_strategy = strategy if strategy and strategy in self.strategies else self.default_strategy
-        if effective_strategy not in self.strategies:
+        fn = self._dispatch.get(strategy) or self._default
+        if fn is None:
+            return {doc.doc_id: 0.0 for doc in documents}
+        return fn(documents, context)
+
+    async def arerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
+        fn = self._adispatch.get(strategy) or self._adefault
+        if fn is None:
             return {doc.doc_id: 0.0 for doc in documents}
-        return self.strategies[effective_strategy].rerank(documents, context)
+        return await fn(documents, context)
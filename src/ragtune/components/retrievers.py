@@ -1,8 +1,13 @@
+from bisect import bisect_right
+from itertools import islice
 from typing import List, Union
 from ragtune.core.interfaces import BaseRetriever
 from ragtune.core.types import ScoredDocument, RAGtuneContext
 from ragtune.registry import registry
 
+# Joins the lowercased corpus; never part of a query, so no match spans two docs
+_SEPARATOR = "\x00"
+
 @registry.retriever("in-memory")
 class InMemoryRetriever(BaseRetriever):
     def __init__(self, documents: List[Union[ScoredDocument, dict]]):
@@ -12,10 +17,39 @@ class InMemoryRetriever(BaseRetriever):
                 self.docs.append(ScoredDocument(**d))
             else:
                 self.docs.append(d)
+        # The corpus is lowercased and joined once, so a retrieve is a single
+        # str.find scan over it instead of a Python-level test per document.
+        lowered = [d.content.lower() for d in self.docs]
+        self._corpus = _SEPARATOR.join(lowered)
+        self._starts = []
+        offset = 0
+        for text in lowered:
+            self._starts.append(offset)
+            offset += len(text) + len(_SEPARATOR)
+
+    def _matching(self, q: str, limit: int) -> List[int]:
+        """Indices of the first limit documents whose lowercased content contains q."""
+        if limit <= 0:
+            return []
+        if not q or _SEPARATOR in q:
+            matches = (i for i, d in enumerate(self.docs) if q in d.content.lower())
+            return list(islice(matches, limit))
+        matches = []
+        corpus, starts = self._corpus, self._starts
+        pos = corpus.find(q)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            matches.append(i)
+            if len(matches) == limit or i + 1 == len(starts):
+                break
+            # Resume at the next document; one hit per document is enough
+            pos = corpus.find(q, starts[i + 1])
+        return matches
 
     def retrieve(self, context: RAGtuneContext, top_k: int) -> List[ScoredDocument]:
-        # Simple keyword match or just return top_k for testing
-        results = [d for d in self.docs if context.query.lower() in d.content.lower()]
+        # Simple keyword match or just return top_k for testing; the scan
+        # stops as soon as top_k documents have matched
+        results = [self.docs[i] for i in self._matching(context.query.lower(), top_k)]
         if not results:
             results = self.docs # Fallback for "fake" tests
         return results[:top_k]
@@ -1,42 +1,70 @@
+import heapq
+from operator import attrgetter
 from typing import List, Optional, Union
 from ragtune.core.interfaces import BaseScheduler
 from ragtune.core.types import BatchProposal, RemainingBudgetView, CostObject
-from ragtune.core.pool import CandidatePool, ItemState
+from ragtune.core.pool import CandidatePool, PoolItem
 from ragtune.registry import registry
 
+# Above this many eligible items, top-k candidates are first narrowed with a
+# NumPy partition on priority_value; below it the conversion isn't worth it.
+_PARTITION_MIN_ITEMS = 128
+_priority_value = attrgetter("priority_value")
+
+
+def _priority_key(item: PoolItem):
+    # Highest priority first, tie-broken by initial_rank then doc_id
+    return (-item.priority_value, item.initial_rank, item.doc_id)
+
+
+def _top_k(items: List[PoolItem], k: int) -> List[PoolItem]:
+    """The first k items in _priority_key order, without sorting all of them."""
+    if len(items) > _PARTITION_MIN_ITEMS and k < len(items):
+        import numpy as np
+        priorities = np.fromiter(map(_priority_value, items), dtype=np.float64, count=len(items))
+        kth = np.partition(priorities, len(items) - k)[len(items) - k]
+        if not np.isnan(kth):
+            # Everything tied with the k-th largest priority stays in, so the
+            # tie-breaks below still see every contender
+            items = [items[i] for i in np.flatnonzero(priorities >= kth)]
+    return heapq.nsmallest(k, items, key=_priority_key)
+
+
 @registry.scheduler("active-learning")
 class ActiveLearningScheduler(BaseScheduler):
     def __init__(
         self, 
         batch_size: int = 5, 
         strategy: str = "cross_encoder",
+        escalation_gap: float = 0.05,
     ):
         self.batch_size = batch_size
         self.strategy = strategy
+        self.escalation_gap = escalation_gap
 
     def select_batch(self, pool: CandidatePool, budget: RemainingBudgetView) -> Optional[BatchProposal]:
+        if budget.remaining_rerank_docs <= 0:
+            return None
         eligible = pool.get_eligible()
-        if not eligible or budget.remaining_rerank_docs <= 0:
+        if not eligible:
             return None
 
-        # Sort by priority_value (set by Estimator in controller loop)
-        # Tie-break by initial_rank then doc_id
-        eligible.sort(key=lambda x: (-x.priority_value, x.initial_rank, x.doc_id))
-        
         batch_size = min(self.batch_size, budget.remaining_rerank_docs, len(eligible))
         if batch_size <= 0:
             return None
-            
-        selected = eligible[:batch_size]
+
+        # Top batch_size by priority_value (set by Estimator in controller loop),
+        # tie-broken by initial_rank then doc_id
+        selected = _top_k(eligible, batch_size)
         doc_ids = [it.doc_id for it in selected]
         
         # Strategy escalation: when the top two candidates are nearly tied
-        # (priority gap < 5%), upgrade from cross_encoder to llm to break the
-        # tie with a more expensive but higher-fidelity signal.
+        # (priority gap < escalation_gap), upgrade from cross_encoder to llm to
+        # break the tie with a more expensive but higher-fidelity signal.
         current_strategy = self.strategy
-        if len(selected) >= 2:
+        if current_strategy == "cross_encoder" and len(selected) >= 2:
             gap = selected[0].priority_value - selected[1].priority_value
-            if gap < 0.05 and current_strategy == "cross_encoder":
+            if gap < self.escalation_gap:
                 current_strategy = "llm"
         
         return BatchProposal(
@@ -52,15 +80,20 @@ class GracefulDegradationScheduler(BaseScheduler):
         self.batch_size = batch_size
 
     def select_batch(self, pool: CandidatePool, budget: RemainingBudgetView) -> Optional[BatchProposal]:
+        if budget.remaining_rerank_docs <= 0:
+            return None
         eligible = pool.get_eligible()
-        if not eligible or budget.remaining_rerank_docs <= 0:
+        if not eligible:
             return None
 
-        # Count how many have been reranked by each strategy
-        active = pool.get_active_items()
-        reranked = [it for it in active if it.state == ItemState.RERANKED]
-        num_llm = len([it for it in reranked if it.reranker_strategy == "llm"])
-        num_ce = len([it for it in reranked if it.reranker_strategy == "cross_encoder"])
+        # Count how many have been reranked by each strategy, in one pass
+        num_llm = num_ce = 0
+        for it in pool.get_reranked():
+            s = it.reranker_strategy
+            if s == "llm":
+                num_llm += 1
+            elif s == "cross_encoder":
+                num_ce += 1
         
         if num_llm < self.llm_limit:
             strategy = "llm"
@@ -71,14 +104,12 @@ class GracefulDegradationScheduler(BaseScheduler):
         else:
             return None
 
-        # Sort eligible by priority_value (from retrieval score usually)
-        eligible.sort(key=lambda x: (-x.priority_value, x.initial_rank, x.doc_id))
-        
         batch_size = min(self.batch_size, budget.remaining_rerank_docs, rem_strategy, len(eligible))
         if batch_size <= 0:
             return None
-            
-        selected = eligible[:batch_size]
+
+        # Top batch_size by priority_value (from retrieval score usually)
+        selected = _top_k(eligible, batch_size)
         return BatchProposal(
             doc_ids=[it.doc_id for it in selected],
             strategy=strategy,
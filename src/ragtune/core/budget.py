@@ -48,33 +48,47 @@ class CostBudget(BaseModel):
         })
 
 class CostTracker:
+    # Fixed attribute set: one tracker is created per run and its attributes are
+    # read on every consume, so skip the per-instance __dict__
+    __slots__ = ("budget", "trace", "consumed", "_start_ns", "_limits", "_tokens_limit", "_docs_limit", "_latency_limit")
+
     def __init__(self, budget: CostBudget, trace: ControllerTrace):
         self.budget = budget
         self.trace = trace
         self.consumed: Dict[str, float] = {}
-        self._start_time = time.time()
+        # Monotonic, so latency budgets are immune to wall-clock adjustments
+        self._start_ns = time.monotonic_ns()
+        # Limits are fixed for the tracker's lifetime: resolve them once rather
+        # than going through the pydantic model on every consume
+        self._limits: Dict[str, float] = dict(budget.limits)
+        # is_exhausted runs every controller iteration; None means unlimited
+        self._tokens_limit: Optional[float] = self._limits.get("tokens")
+        self._docs_limit: Optional[float] = self._limits.get("rerank_docs")
+        self._latency_limit: Optional[float] = self._limits.get("latency_ms")
 
     @property
     def elapsed_ms(self) -> float:
-        return (time.time() - self._start_time) * 1000
+        return (time.monotonic_ns() - self._start_ns) / 1e6
 
     def is_exhausted(self) -> bool:
         """Check if any critical budget is zero/negative."""
         # For simple v0.54, we just check tokens and docs
-        if "tokens" in self.budget.limits and self.consumed.get("tokens", 0) >= self.budget.limits["tokens"]:
+        consumed = self.consumed
+        if self._tokens_limit is not None and consumed.get("tokens", 0) >= self._tokens_limit:
             return True
-        if "rerank_docs" in self.budget.limits and self.consumed.get("rerank_docs", 0) >= self.budget.limits["rerank_docs"]:
+        if self._docs_limit is not None and consumed.get("rerank_docs", 0) >= self._docs_limit:
             return True
-        if "latency_ms" in self.budget.limits and self.elapsed_ms >= self.budget.limits["latency_ms"]:
+        if self._latency_limit is not None and self.elapsed_ms >= self._latency_limit:
             return True
         return False
 
     def remaining_view(self) -> RemainingBudgetView:
         """Provides an immutable-ish view of what's left for the Scheduler."""
+        limits = self._limits
         return RemainingBudgetView(
-            remaining_tokens=max(0, int(self.budget.limits.get("tokens", 0) - self.consumed.get("tokens", 0))),
-            remaining_rerank_docs=max(0, int(self.budget.limits.get("rerank_docs", 0) - self.consumed.get("rerank_docs", 0))),
-            remaining_rerank_calls=max(0, int(self.budget.limits.get("rerank_calls", 0) - self.consumed.get("rerank_calls", 0))),
+            remaining_tokens=max(0, int(limits.get("tokens", 0) - self.consumed.get("tokens", 0))),
+            remaining_rerank_docs=max(0, int(limits.get("rerank_docs", 0) - self.consumed.get("rerank_docs", 0))),
+            remaining_rerank_calls=max(0, int(limits.get("rerank_calls", 0) - self.consumed.get("rerank_calls", 0))),
         )
 
     def consume(self, cost: CostObject):
@@ -85,32 +99,33 @@ class CostTracker:
 
     def try_consume(self, cost_type: str, amount: float = 1.0) -> bool:
         """Generic consumption method for any cost type."""
+        trace = self.trace
         # 1. Check Latency (Global constraint)
-        if cost_type != "latency_ms" and "latency_ms" in self.budget.limits:
-            if self.elapsed_ms > self.budget.limits["latency_ms"]:
-                self.trace.add("budget", f"deny_{cost_type}", reason="latency_exceeded", elapsed=self.elapsed_ms)
+        latency_limit = self._latency_limit
+        if latency_limit is not None and cost_type != "latency_ms":
+            elapsed = self.elapsed_ms
+            if elapsed > latency_limit:
+                trace.add("budget", f"deny_{cost_type}", reason="latency_exceeded", elapsed=elapsed)
                 return False
 
-        # 2. Check Capacity
-        limit = self.budget.limits.get(cost_type)
+        # 2. Check Capacity. Always accumulate into consumed — even denied
+        # attempts count toward the running total so that is_exhausted() and
+        # remaining_view() stay accurate for budget projection.
+        consumed = self.consumed
+        total = consumed.get(cost_type, 0.0) + amount
+        consumed[cost_type] = total
+
+        limit = self._limits.get(cost_type)
         if limit is None:
             # No limit defined: allow unconditionally and track for observability.
-            current = self.consumed.get(cost_type, 0.0)
-            self.consumed[cost_type] = current + amount
-            self.trace.add("budget", f"consume_{cost_type}_unlimited", count=amount, total=self.consumed[cost_type])
+            trace.add("budget", f"consume_{cost_type}_unlimited", count=amount, total=total)
             return True
 
-        # Always accumulate into consumed — even denied attempts count toward the
-        # running total so that is_exhausted() and remaining_view() stay accurate
-        # for budget projection. Returns False when the new total exceeds the limit.
-        current = self.consumed.get(cost_type, 0.0)
-        self.consumed[cost_type] = current + amount
-
-        if self.consumed[cost_type] <= limit:
-            self.trace.add("budget", f"consume_{cost_type}", count=amount, total=self.consumed[cost_type])
+        if total <= limit:
+            trace.add("budget", f"consume_{cost_type}", count=amount, total=total)
             return True
 
-        self.trace.add("budget", f"over_limit_{cost_type}", count=amount, total=self.consumed[cost_type], limit=limit)
+        trace.add("budget", f"over_limit_{cost_type}", count=amount, total=total, limit=limit)
         return False
 
     # Legacy-style helpers for convenience
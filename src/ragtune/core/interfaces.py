@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any, Tuple
 from ragtune.core.types import ScoredDocument, BatchProposal, RAGtuneContext, RemainingBudgetView, EstimatorOutput
@@ -15,6 +16,10 @@ class BaseReranker(ABC):
         """Returns {doc_id: score}."""
         pass
 
+    async def arerank(self, documents: List[PoolItem], context: RAGtuneContext, strategy: Optional[str] = None) -> Dict[str, float]:
+        """Async rerank; by default runs rerank() in a worker thread."""
+        return await asyncio.to_thread(self.rerank, documents, context, strategy)
+
 
 class BaseReformulator(ABC):
     @abstractmethod
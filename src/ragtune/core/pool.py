@@ -1,7 +1,32 @@
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 from ragtune.core.types import IllegalTransitionError, ItemState, ScoredDocument
 
+if TYPE_CHECKING:
+    import numpy as np
+
+class SourceScores(dict):
+    """
+    {source: score} mapping that remembers its maximum score until it is mutated.
+    """
+    _max: Optional[float] = None
+
+    def max_score(self) -> float:
+        if self._max is None:
+            self._max = max(self.values()) if self else 0.0
+        return self._max
+
+def _invalidating(name: str):
+    method = getattr(dict, name)
+    def wrapper(self, *args, **kwargs):
+        self._max = None
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+for _name in ("__setitem__", "__delitem__", "__ior__", "clear", "pop", "popitem", "setdefault", "update"):
+    setattr(SourceScores, _name, _invalidating(_name))
+
 class PoolItem(BaseModel):
     doc_id: str                      # Primary Key
     content: str
@@ -19,6 +44,28 @@ class PoolItem(BaseModel):
     reranker_score: Optional[float] = None
     reranker_strategy: Optional[str] = None
 
+    _content_tokens: Optional[int] = PrivateAttr(default=None)
+
+    @field_validator("sources", mode="after")
+    @classmethod
+    def _track_sources(cls, v: Dict[str, float]) -> Dict[str, float]:
+        return v if isinstance(v, SourceScores) else SourceScores(v)
+
+    @property
+    def max_source_score(self) -> float:
+        """Best retrieval score across sources (0.0 if none), cached until sources change."""
+        sources = self.sources
+        if isinstance(sources, SourceScores):
+            return sources.max_score()
+        return max(sources.values()) if sources else 0.0
+
+    @property
+    def content_tokens(self) -> int:
+        """Word-based token estimate (words * 1.3) of content, computed once per item."""
+        if self._content_tokens is None:
+            self._content_tokens = int(len(self.content.split()) * 1.3)
+        return self._content_tokens
+
     def final_score(self) -> float:
         """
         Precedence: Reranker > Estimator > Retrieval Baseline.
@@ -27,7 +74,7 @@ class PoolItem(BaseModel):
             return self.reranker_score
         if self.priority_value > 0:
             return self.priority_value
-        return max(self.sources.values()) if self.sources else 0.0
+        return self.max_source_score
 
 class CandidatePool:
     ALLOWED_TRANSITIONS = {
@@ -117,6 +164,10 @@ class CandidatePool:
         """Returns items in the CANDIDATE state."""
         return [it for it in self._items.values() if it.state == ItemState.CANDIDATE]
 
+    def get_reranked(self) -> List[PoolItem]:
+        """Returns items in the RERANKED state."""
+        return [it for it in self._items.values() if it.state == ItemState.RERANKED]
+
     def get_items(self, doc_ids: List[str]) -> List[PoolItem]:
         """Returns items by ID mapping."""
         return [self._items[did] for did in doc_ids if did in self._items]
@@ -126,6 +177,35 @@ class CandidatePool:
         return [it for it in self._items.values() 
                 if it.state in (ItemState.CANDIDATE, ItemState.RERANKED)]
 
+    def source_matrix(
+        self, items: Optional[List[PoolItem]] = None, sources: Optional[Sequence[str]] = None
+    ) -> Tuple[List[str], "np.ndarray"]:
+        """
+        Returns (source_names, S) where S[i, j] is the score items[i] got from
+        source_names[j], 0.0 where absent. items defaults to the whole pool and
+        sources to the sorted union of their sources; other sources are ignored.
+        """
+        import numpy as np
+
+        if items is None:
+            items = list(self._items.values())
+        if sources is None:
+            sources = sorted({s for it in items for s in it.sources})
+        columns = {s: j for j, s in enumerate(sources)}
+
+        rows, cols, vals = [], [], []
+        for i, it in enumerate(items):
+            for s, v in it.sources.items():
+                j = columns.get(s)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+                    vals.append(v)
+
+        S = np.zeros((len(items), len(sources)))
+        S[rows, cols] = vals
+        return list(sources), S
+
     def get_metrics(self) -> Dict[str, Any]:
         """Calculates retrieval efficiency and overlap metrics."""
         total = len(self._items)
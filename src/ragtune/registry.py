@@ -1,4 +1,52 @@
-from typing import Dict, Any, Optional
+import importlib
+from typing import Dict, Any, List, Optional
+
+# Built-in components: category -> {name: defining module}. Getters import the
+# module on a miss, so only the backends a config actually uses get loaded.
+BUILTIN_COMPONENTS: Dict[str, Dict[str, str]] = {
+    "reranker": {
+        "noop": "ragtune.components.rerankers",
+        "cross-encoder": "ragtune.components.rerankers",
+        "llm": "ragtune.components.rerankers",
+        "simulated": "ragtune.components.rerankers",
+        "ollama-listwise": "ragtune.components.rerankers",
+        "monot5": "ragtune.components.rerankers",
+        "multi-strategy": "ragtune.components.rerankers",
+    },
+    "retriever": {
+        "in-memory": "ragtune.components.retrievers",
+        "pyterrier": "ragtune.adapters.pyterrier",
+        "langchain": "ragtune.adapters.langchain",
+        "llamaindex": "ragtune.adapters.llamaindex",
+    },
+    "reformulator": {
+        "identity": "ragtune.components.reformulators",
+        "llm_rewrite": "ragtune.components.reformulators",
+        "reformir": "ragtune.components.reformulators",
+    },
+    "assembler": {
+        "greedy": "ragtune.components.assemblers",
+        "mmr": "ragtune.components.assemblers",
+    },
+    "scheduler": {
+        "active-learning": "ragtune.components.schedulers",
+        "graceful-degradation": "ragtune.components.schedulers",
+    },
+    "estimator": {
+        "baseline": "ragtune.components.estimators",
+        "utility": "ragtune.components.estimators",
+        "similarity": "ragtune.components.estimators",
+        "reformir": "ragtune.components.estimators",
+        "composite": "ragtune.components.estimators",
+    },
+    "indexer": {
+        "pyterrier": "ragtune.indexing.pyterrier_indexer",
+    },
+    "feedback": {
+        "budget-stop": "ragtune.components.feedback",
+        "reformir-convergence": "ragtune.components.feedback",
+    },
+}
 
 class Registry:
     def __init__(self):
@@ -10,78 +58,91 @@ class Registry:
         self._estimators: Dict[str, Any] = {}
         self._indexers: Dict[str, Any] = {}
         self._feedback: Dict[str, Any] = {}
+        # Bumped whenever an existing name is re-registered, so callers caching
+        # resolved components know their entries may be stale
+        self.version = 0
 
-    def reranker(self, name: str):
+    def _registrar(self, table: Dict[str, Any], name: str):
         def wrapper(cls_or_func):
-            self._rerankers[name] = cls_or_func
+            if name in table and table[name] is not cls_or_func:
+                self.version += 1
+            table[name] = cls_or_func
             return cls_or_func
         return wrapper
 
+    def reranker(self, name: str):
+        return self._registrar(self._rerankers, name)
+
     def retriever(self, name: str):
-        def wrapper(cls_or_func):
-            self._retrievers[name] = cls_or_func
-            return cls_or_func
-        return wrapper
+        return self._registrar(self._retrievers, name)
 
     def reformulator(self, name: str):
-        def wrapper(cls_or_func):
-            self._reformulators[name] = cls_or_func
-            return cls_or_func
-        return wrapper
+        return self._registrar(self._reformulators, name)
 
     def assembler(self, name: str):
-        def wrapper(cls_or_func):
-            self._assemblers[name] = cls_or_func
-            return cls_or_func
-        return wrapper
+        return self._registrar(self._assemblers, name)
 
     def scheduler(self, name: str):
-        def wrapper(cls_or_func):
-            self._schedulers[name] = cls_or_func
-            return cls_or_func
-        return wrapper
+        return self._registrar(self._schedulers, name)
 
     def estimator(self, name: str):
-        def wrapper(cls_or_func):
-            self._estimators[name] = cls_or_func
-            return cls_or_func
-        return wrapper
+        return self._registrar(self._estimators, name)
 
     def indexer(self, name: str):
-        def wrapper(cls_or_func):
-            self._indexers[name] = cls_or_func
-            return cls_or_func
-        return wrapper
+        return self._registrar(self._indexers, name)
 
     def feedback(self, name: str):
-        def wrapper(cls_or_func):
-            self._feedback[name] = cls_or_func
-            return cls_or_func
-        return wrapper
+        return self._registrar(self._feedback, name)
 
     def get_reranker(self, name: str):
-        return self._rerankers.get(name)
+        return self._lookup("reranker", self._rerankers, name)
 
     def get_retriever(self, name: str):
-        return self._retrievers.get(name)
+        return self._lookup("retriever", self._retrievers, name)
 
     def get_reformulator(self, name: str):
-        return self._reformulators.get(name)
+        return self._lookup("reformulator", self._reformulators, name)
 
     def get_assembler(self, name: str):
-        return self._assemblers.get(name)
+        return self._lookup("assembler", self._assemblers, name)
 
     def get_scheduler(self, name: str):
-        return self._schedulers.get(name)
+        return self._lookup("scheduler", self._schedulers, name)
 
     def get_estimator(self, name: str):
-        return self._estimators.get(name)
+        return self._lookup("estimator", self._estimators, name)
 
     def get_indexer(self, name: str):
-        return self._indexers.get(name)
+        return self._lookup("indexer", self._indexers, name)
 
     def get_feedback(self, name: str):
-        return self._feedback.get(name)
+        return self._lookup("feedback", self._feedback, name)
+
+    def _lookup(self, category: str, table: Dict[str, Any], name: str):
+        if name not in table:
+            module = BUILTIN_COMPONENTS.get(category, {}).get(name)
+            if module:
+                try:
+                    importlib.import_module(module)
+                except ImportError:
+                    # Optional backend (e.g. pyterrier) not installed
+                    return None
+        return table.get(name)
+
+    def load_builtins(self) -> None:
+        """Imports every built-in component module whose dependencies are installed."""
+        modules = dict.fromkeys(m for names in BUILTIN_COMPONENTS.values() for m in names.values())
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+
+    def list_names(self, category: str) -> List[str]:
+        """Names available for a category (built-in and registered) without importing anything."""
+        names = list(BUILTIN_COMPONENTS.get(category, {}))
+        registered = self.list_all().get(category, {})
+        return names + [n for n in registered if n not in names]
 
     def list_all(self) -> Dict[str, Dict[str, Any]]:
         return {
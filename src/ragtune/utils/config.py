@@ -1,7 +1,23 @@
+import json
 import yaml
 from typing import Any, Dict
 from pathlib import Path
 
+# Prefer the libyaml-backed C implementations when PyYAML was built with them.
+try:
+    from yaml import CSafeDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeDumper as YamlDumper, SafeLoader as YamlLoader
+
+def dump_config(data: Dict[str, Any], path: Path) -> None:
+    """Write a pipeline config as YAML, or as JSON when path ends in .json."""
+    path = Path(path)
+    with open(path, "w") as f:
+        if path.suffix.lower() == ".json":
+            json.dump(data, f, indent=2)
+        else:
+            yaml.dump(data, f, Dumper=YamlDumper, sort_keys=False)
+
 class ConfigLoader:
     _instance = None
     _config = {}
@@ -20,13 +36,13 @@ class ConfigLoader:
         defaults_path = base_path / "defaults.yaml"
         if defaults_path.exists():
             with open(defaults_path, "r") as f:
-                self._config = yaml.safe_load(f) or {}
+                self._config = yaml.load(f, Loader=YamlLoader) or {}
 
         # Load prompts
         prompts_path = base_path / "prompts.yaml"
         if prompts_path.exists():
             with open(prompts_path, "r") as f:
-                self._prompts = yaml.safe_load(f) or {}
+                self._prompts = yaml.load(f, Loader=YamlLoader) or {}
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """Get a value from config using dot notation (e.g., 'retrieval.pool_multiplier')"""
@@ -58,3 +58,28 @@ def test_ragtune_transformer_conversion():
     assert res_df.iloc[1]["docno"] == "d_out_2"
     assert "text" in res_df.columns
     assert res_df.iloc[0]["text"] == "Result 1"
+
+def test_pyterrier_retriever_empty_result():
+    mock_pt = MagicMock()
+    mock_pt.transform.return_value = pd.DataFrame(columns=["qid", "docno", "text", "score"])
+
+    adapter = PyTerrierRetriever(mock_pt)
+    tracker = CostTracker(CostBudget(), ControllerTrace())
+    context = RAGtuneContext(query="test query", tracker=tracker)
+
+    assert adapter.retrieve(context) == []
+
+def test_pyterrier_retriever_sorts_unranked_results():
+    mock_pt = MagicMock()
+    mock_pt.transform.return_value = pd.DataFrame([
+        {"qid": "q1", "docno": "d1", "text": "low", "score": 1.0},
+        {"qid": "q1", "docno": "d2", "text": "high", "score": 5.0},
+        {"qid": "q1", "docno": "d3", "text": "mid", "score": 3.0},
+    ])
+
+    adapter = PyTerrierRetriever(mock_pt)
+    tracker = CostTracker(CostBudget(), ControllerTrace())
+    context = RAGtuneContext(query="test query", tracker=tracker)
+    results = adapter.retrieve(context, top_k=2)
+
+    assert [r.id for r in results] == ["d2", "d3"]
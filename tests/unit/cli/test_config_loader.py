@@ -0,0 +1,104 @@
+"""Unit tests for the pipeline config loader."""
+
+import pytest
+
+from ragtune.cli.config_loader import ConfigLoader
+from ragtune.components.estimators import CompositeEstimator
+from ragtune.components.schedulers import ActiveLearningScheduler
+from ragtune.utils.config import dump_config
+
+
+def _config(batch_size=5, estimator=None):
+    return {
+        "pipeline": {
+            "components": {
+                "retriever": {"type": "in-memory", "params": {"documents": []}},
+                "reranker": {"type": "noop"},
+                "reformulator": {"type": "identity"},
+                "assembler": {"type": "greedy"},
+                "scheduler": {"type": "active-learning", "params": {"batch_size": batch_size}},
+                "estimator": estimator or {"type": "baseline"},
+            },
+            "budget": {"limits": {"tokens": 1000}},
+        }
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clear_factory_cache():
+    ConfigLoader.clear_cache()
+    yield
+    ConfigLoader.clear_cache()
+
+
+class TestCreateController:
+    """Tests for ConfigLoader.create_controller."""
+
+    def test_builds_components_from_config(self):
+        controller = ConfigLoader.create_controller(_config())
+
+        assert isinstance(controller.scheduler, ActiveLearningScheduler)
+        assert controller.scheduler.batch_size == 5
+        assert controller.budget.limits == {"tokens": 1000}
+        assert controller.feedback is None
+
+    def test_same_shape_reuses_factory_with_new_params(self):
+        first = ConfigLoader.create_controller(_config(batch_size=2))
+        second = ConfigLoader.create_controller(_config(batch_size=7))
+
+        assert len(ConfigLoader._factory_cache) == 1
+        assert first.scheduler.batch_size == 2
+        assert second.scheduler.batch_size == 7
+        assert first.scheduler is not second.scheduler
+
+    def test_different_shape_compiles_new_factory(self):
+        ConfigLoader.create_controller(_config())
+        controller = ConfigLoader.create_controller(
+            _config(estimator=[{"type": "baseline"}, {"type": "utility"}])
+        )
+
+        assert len(ConfigLoader._factory_cache) == 2
+        assert isinstance(controller.estimator, CompositeEstimator)
+        assert len(controller.estimator.estimators) == 2
+
+    def test_unknown_type_raises_and_is_not_cached(self):
+        config = _config()
+        config["pipeline"]["components"]["reranker"] = {"type": "does-not-exist"}
+
+        with pytest.raises(ValueError, match="does-not-exist"):
+            ConfigLoader.create_controller(config)
+        assert not ConfigLoader._factory_cache
+
+    def test_reregistered_type_is_picked_up(self):
+        from ragtune.registry import registry
+
+        ConfigLoader.create_controller(_config())
+
+        class CustomScheduler(ActiveLearningScheduler):
+            pass
+
+        registry.scheduler("active-learning")(CustomScheduler)
+        try:
+            controller = ConfigLoader.create_controller(_config())
+        finally:
+            registry.scheduler("active-learning")(ActiveLearningScheduler)
+
+        assert type(controller.scheduler) is CustomScheduler
+
+    def test_factory_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(ConfigLoader, "_factory_cache_size", 2)
+        for estimator in ("baseline", "utility", "baseline"):
+            ConfigLoader.create_controller(_config(estimator={"type": estimator}))
+        ConfigLoader.create_controller(_config(estimator=[{"type": "baseline"}]))
+
+        assert len(ConfigLoader._factory_cache) == 2
+        # "utility" was the least recently used shape
+        shapes = [dict(shape)["estimator"] for shape in ConfigLoader._factory_cache]
+        assert shapes == [("type", "baseline"), (("type", "baseline"),)]
+
+
+@pytest.mark.parametrize("filename", ["pipeline.yaml", "pipeline.json"])
+def test_dump_config_round_trips(tmp_path, filename):
+    path = tmp_path / filename
+    dump_config(_config(), path)
+    assert ConfigLoader.load_config(path) == _config()
@@ -6,11 +6,15 @@ from unittest.mock import patch, MagicMock
 from ragtune.cli.visualize import (
     ComponentBox,
     PipelineFlowRenderer,
+    format_budget,
+    render_pipeline_flow_plain,
     parse_value,
     get_available_types,
     show_diff,
     edit_component,
     edit_budget,
+    run_interactive_editor,
+    _fast_diff,
 )
 
 
@@ -103,6 +107,45 @@ class TestPipelineFlowRenderer:
 
         assert "Test Pipeline" in panel.title
 
+    def test_box_cache_reused_across_renders(self, sample_config):
+        """Test that a shared box cache is filled once and reused on redraw."""
+        box_cache = {}
+        PipelineFlowRenderer(sample_config, box_cache=box_cache).render()
+        assert ("retriever", "bm25") in box_cache
+        assert len(box_cache) == 6
+
+        sample_config["pipeline"]["components"]["retriever"]["type"] = "pyterrier"
+        with patch('ragtune.cli.visualize.ComponentBox', wraps=ComponentBox) as box_cls:
+            PipelineFlowRenderer(sample_config, box_cache=box_cache).render()
+            assert box_cls.call_count == 1
+        assert ("retriever", "pyterrier") in box_cache
+
+
+class TestPlainRendering:
+    """Tests for the non-terminal text output."""
+
+    def test_format_budget_drops_integral_float_suffix(self):
+        assert format_budget({"tokens": 5000, "latency_ms": 2000.0, "ratio": 0.5}) == (
+            "tokens=5000 | latency_ms=2000 | ratio=0.5"
+        )
+
+    def test_render_plain_lists_components_and_budget(self, capsys):
+        config = {
+            "pipeline": {
+                "name": "Plain",
+                "components": {"retriever": {"type": "bm25"}, "estimator": {"type": "baseline"}},
+                "budget": {"limits": {"tokens": 100}},
+            }
+        }
+        render_pipeline_flow_plain(config)
+        out = capsys.readouterr().out.splitlines()
+
+        assert out[0] == "Pipeline: Plain"
+        assert "retriever: bm25" in out
+        assert "reranker: noop" in out
+        assert "estimator: baseline" in out
+        assert out[-1] == "Budget: tokens=100"
+
 
 class TestParseValue:
     """Tests for the parse_value function."""
@@ -111,11 +154,15 @@ class TestParseValue:
         assert parse_value("42") == 42
         assert parse_value("-10") == -10
         assert parse_value("0") == 0
+        assert parse_value("+7") == 7
+        assert isinstance(parse_value("42"), int)
 
     def test_parse_float(self):
         assert parse_value("3.14") == 3.14
         assert parse_value("-2.5") == -2.5
         assert parse_value("0.0") == 0.0
+        assert parse_value("1e3") == 1000.0
+        assert isinstance(parse_value("1e3"), float)
 
     def test_parse_boolean_true(self):
         assert parse_value("true") is True
@@ -169,7 +216,7 @@ class TestShowDiff:
         config = {"pipeline": {"name": "test"}}
 
         # Patch console to capture output
-        with patch('ragtune.cli.visualize.console') as mock_console:
+        with patch('ragtune.cli.console._console') as mock_console:
             show_diff(config, config)
             # Check that "No changes" message was printed
             calls = mock_console.print.call_args_list
@@ -180,11 +227,47 @@ class TestShowDiff:
         original = {"pipeline": {"name": "original"}}
         modified = {"pipeline": {"name": "modified"}}
 
-        with patch('ragtune.cli.visualize.console') as mock_console:
+        with patch('ragtune.cli.console._console') as mock_console:
             show_diff(original, modified)
             # Should have been called with colored output
             assert mock_console.print.called
 
+    def test_precomputed_original_yaml(self):
+        """Test that a pre-serialized original is used instead of re-dumping."""
+        import yaml
+
+        original = {"pipeline": {"name": "original"}}
+        modified = {"pipeline": {"name": "modified"}}
+        original_yaml = yaml.dump(original, sort_keys=False, default_flow_style=False)
+
+        with patch('ragtune.cli.console._console') as mock_console:
+            show_diff(original, modified, original_yaml=original_yaml)
+            calls = [str(call) for call in mock_console.print.call_args_list]
+            assert any("-  name: original" in call for call in calls)
+            assert any("+  name: modified" in call for call in calls)
+
+
+class TestFastDiff:
+    """Tests for the single-pass diff used on small configs."""
+
+    @pytest.mark.parametrize("original, modified", [
+        (["x: 1\n", "y: 2\n", "z: 3\n"], ["x: 1\n", "y: 5\n", "z: 3\n"]),
+        (["x\n"], ["x\n", "y\n"]),
+        (["x\n", "y\n"], ["x\n"]),
+        (["a\n", "b\n", "c\n"], ["b\n", "c\n", "d\n"]),
+    ])
+    def test_matches_zero_context_unified_diff(self, original, modified):
+        import difflib
+
+        expected = list(difflib.unified_diff(
+            original, modified, fromfile="original", tofile="modified", lineterm="", n=0
+        ))
+        assert list(_fast_diff(original, modified, "original", "modified")) == expected
+
+    def test_identical_input_yields_nothing(self):
+        lines = ["a\n", "b\n"]
+        assert list(_fast_diff(lines, list(lines), "original", "modified")) == []
+
 
 class TestEditComponent:
     """Tests for edit_component function (non-interactive aspects)."""
@@ -194,7 +277,7 @@ class TestEditComponent:
         config = {"pipeline": {"components": {}}}
 
         # Mock the prompts to return default values without interaction
-        with patch('ragtune.cli.visualize.Confirm.ask', return_value=False):
+        with patch('rich.prompt.Confirm.ask', return_value=False):
             result = edit_component(config, "retriever")
 
         assert "retriever" in result["pipeline"]["components"]
@@ -209,7 +292,7 @@ class TestEditComponent:
             }
         }
 
-        with patch('ragtune.cli.visualize.Confirm.ask', return_value=False):
+        with patch('rich.prompt.Confirm.ask', return_value=False):
             result = edit_component(config, "retriever")
 
         assert result["pipeline"]["components"]["retriever"]["type"] == "bm25"
@@ -224,8 +307,33 @@ class TestEditBudget:
         config = {"pipeline": {}}
 
         # Mock prompts to exit immediately
-        with patch('ragtune.cli.visualize.Prompt.ask', return_value="d"):
+        with patch('rich.prompt.Prompt.ask', return_value="d"):
             result = edit_budget(config)
 
         assert "budget" in result["pipeline"]
         assert "limits" in result["pipeline"]["budget"]
+
+
+class TestRunInteractiveEditor:
+    """Tests for the editor loop with scripted prompts."""
+
+    def test_save_returns_edited_copy_and_leaves_input_untouched(self):
+        config = {"pipeline": {"name": "p", "budget": {"limits": {"tokens": 10}}}}
+        answers = ["7", "m", "tokens", "20", "d", "s"]
+
+        with patch('ragtune.cli.console._console'), \
+                patch('rich.prompt.Prompt.ask', side_effect=answers), \
+                patch('rich.prompt.Confirm.ask', return_value=True):
+            result = run_interactive_editor(None, config)
+
+        assert result["pipeline"]["budget"]["limits"]["tokens"] == 20
+        assert config["pipeline"]["budget"]["limits"]["tokens"] == 10
+
+    def test_quit_without_changes_returns_none(self):
+        config = {"pipeline": {"name": "p"}}
+
+        with patch('ragtune.cli.console._console'), \
+                patch('rich.prompt.Prompt.ask', return_value="q"), \
+                patch('rich.prompt.Confirm.ask') as confirm:
+            assert run_interactive_editor(None, config) is None
+            confirm.assert_not_called()
@@ -1,8 +1,10 @@
 import pytest
+import numpy as np
+from unittest.mock import MagicMock, patch
 from ragtune.core.pool import PoolItem, ItemState
 from ragtune.core.types import RAGtuneContext, ScoredDocument, ControllerTrace
 from ragtune.core.budget import CostTracker, CostBudget
-from ragtune.components.assemblers import GreedyAssembler
+from ragtune.components.assemblers import GreedyAssembler, MMRAssembler
 
 def test_greedy_assembler_precedence_invariant():
     """
@@ -43,3 +45,136 @@ def test_greedy_assembler_precedence_invariant():
     
     if reranked_indices and candidate_indices:
         assert max(reranked_indices) < min(candidate_indices)
+
+def test_greedy_assembler_max_docs_matches_full_sort():
+    """Bounding each partition to max_docs must not change the selected order."""
+    assembler = GreedyAssembler(max_docs=5)
+    tracker = CostTracker(CostBudget(), ControllerTrace())
+    ctx = RAGtuneContext(query="test", tracker=tracker)
+
+    items = []
+    for i in range(40):
+        if i % 3 == 0:
+            items.append(PoolItem(doc_id=f"r{i}", content="c", sources={"ret": 0.1}, initial_rank=i,
+                                  reranker_score=(i * 7 % 5) / 10, state=ItemState.RERANKED))
+        else:
+            items.append(PoolItem(doc_id=f"c{i}", content="c", sources={"ret": (i * 11 % 7) / 10}, initial_rank=i))
+
+    reranked = sorted((it for it in items if it.reranker_score is not None),
+                      key=lambda x: (-x.reranker_score, x.initial_rank))
+    others = sorted((it for it in items if it.reranker_score is None),
+                    key=lambda x: (-x.final_score(), x.initial_rank))
+    expected = [it.doc_id for it in reranked + others][:5]
+
+    results = assembler.assemble(items, ctx)
+    assert [r.id for r in results] == expected
+
+def test_greedy_assembler_stops_at_first_token_denial():
+    """Once the token budget rejects a doc, no further docs are offered to it."""
+    assembler = GreedyAssembler()
+    tracker = CostTracker(CostBudget(limits={"tokens": 25}), ControllerTrace())
+    ctx = RAGtuneContext(query="test", tracker=tracker)
+
+    items = [
+        PoolItem(doc_id=f"d{i}", content="c", metadata={"token_count": 10}, sources={"ret": 1.0 - i / 10}, initial_rank=i)
+        for i in range(6)
+    ]
+
+    results = assembler.assemble(items, ctx)
+
+    assert [r.id for r in results] == ["d0", "d1"]
+    assert all(r.token_count == 10 for r in results)
+    denials = [e for e in tracker.trace.events if e.action == "over_limit_tokens"]
+    assert len(denials) == 1
+
+
+def test_greedy_assembler_singleton_fallback_beats_greedy_set():
+    """The budget stops greedy after a weak doc; one strong doc that fits alone is worth more."""
+    assembler = GreedyAssembler()
+    tracker = CostTracker(CostBudget(limits={"tokens": 40}), ControllerTrace())
+    ctx = RAGtuneContext(query="test", tracker=tracker)
+    items = [
+        PoolItem(doc_id="weak", content="c", metadata={"token_count": 10}, sources={"ret": 0.1},
+                 reranker_score=0.1, state=ItemState.RERANKED, initial_rank=0),
+        PoolItem(doc_id="huge", content="c", metadata={"token_count": 50}, sources={"ret": 0.9}, initial_rank=1),
+        PoolItem(doc_id="strong", content="c", metadata={"token_count": 30}, sources={"ret": 0.8}, initial_rank=2),
+    ]
+
+    results = assembler.assemble(items, ctx)
+
+    assert [r.id for r in results] == ["strong"]
+    assert tracker.consumed["tokens"] == 30
+    assert not [e for e in tracker.trace.events if e.action == "over_limit_tokens"]
+
+def test_greedy_assembler_negative_scores_keep_greedy_set():
+    assembler = GreedyAssembler()
+    tracker = CostTracker(CostBudget(limits={"tokens": 20}), ControllerTrace())
+    ctx = RAGtuneContext(query="test", tracker=tracker)
+    items = [
+        PoolItem(doc_id=f"d{i}", content="c", metadata={"token_count": 10}, sources={"ret": 0.5},
+                 reranker_score=-1.0 - i, state=ItemState.RERANKED, initial_rank=i)
+        for i in range(3)
+    ]
+
+    results = assembler.assemble(items, ctx)
+
+    assert [r.id for r in results] == ["d0", "d1"]
+
+def _mmr_assembler(vectors, **kwargs):
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        mock_model.encode.side_effect = lambda texts, **kw: np.array([vectors[t] for t in texts])
+        return MMRAssembler(model_name="mock", **kwargs)
+
+def test_mmr_assembler_skips_near_duplicates():
+    vectors = {
+        "q": [0.8, 0.6],
+        "fox": [1.0, 0.0],
+        "fox again": [1.0, 0.0],
+        "dog": [0.0, 1.0],
+    }
+    assembler = _mmr_assembler(vectors, beta=1.0, max_docs=2)
+    tracker = CostTracker(CostBudget(), ControllerTrace())
+    ctx = RAGtuneContext(query="q", tracker=tracker)
+    items = [
+        PoolItem(doc_id="a", content="fox", sources={"ret": 0.9}, initial_rank=0),
+        PoolItem(doc_id="b", content="fox again", sources={"ret": 0.8}, initial_rank=1),
+        PoolItem(doc_id="c", content="dog", sources={"ret": 0.7}, initial_rank=2),
+    ]
+
+    results = assembler.assemble(items, ctx)
+
+    assert [r.id for r in results] == ["a", "c"]
+    assert tracker.consumed["tokens"] == sum(r.token_count for r in results)
+
+def test_mmr_assembler_respects_token_budget():
+    vectors = {"q": [1.0, 0.0], "big": [1.0, 0.0], "small": [0.8, 0.6]}
+    assembler = _mmr_assembler(vectors)
+    tracker = CostTracker(CostBudget(limits={"tokens": 50}), ControllerTrace())
+    ctx = RAGtuneContext(query="q", tracker=tracker)
+    items = [
+        PoolItem(doc_id="big", content="big", metadata={"token_count": 100}, sources={"ret": 0.9}),
+        PoolItem(doc_id="small", content="small", metadata={"token_count": 20}, sources={"ret": 0.5}),
+    ]
+
+    results = assembler.assemble(items, ctx)
+
+    assert [r.id for r in results] == ["small"]
+    assert tracker.consumed["tokens"] == 20
+
+def test_mmr_assembler_cost_scaled_singleton_fallback():
+    """Cost scaling favours the cheap doc, but the expensive one alone is worth more."""
+    vectors = {"q": [1.0, 0.0], "long": [1.0, 0.0], "short": [0.1, 0.995]}
+    assembler = _mmr_assembler(vectors, cost_scaled=True)
+    tracker = CostTracker(CostBudget(limits={"tokens": 100}), ControllerTrace())
+    ctx = RAGtuneContext(query="q", tracker=tracker)
+    items = [
+        PoolItem(doc_id="long", content="long", metadata={"token_count": 100}, sources={"ret": 0.9}),
+        PoolItem(doc_id="short", content="short", metadata={"token_count": 5}, sources={"ret": 0.5}),
+    ]
+
+    results = assembler.assemble(items, ctx)
+
+    assert [r.id for r in results] == ["long"]
+    assert tracker.consumed["tokens"] == 100
@@ -1,6 +1,6 @@
 import pytest
 from ragtune.core.pool import CandidatePool, PoolItem, ItemState
-from ragtune.core.types import RAGtuneContext, ControllerTrace
+from ragtune.core.types import RAGtuneContext, ControllerTrace, EstimatorOutput
 from ragtune.core.budget import CostTracker, CostBudget
 from ragtune.components.estimators import UtilityEstimator
 
@@ -41,3 +41,112 @@ def test_estimator_boost_by_source():
     estimates_with_sources = estimator.value(pool, context)
     assert estimates_with_sources["b"].priority > 0.5  # Boosted
     assert estimates_with_sources["c"].priority == 0.5  # Not boosted
+
+def test_estimator_metadata_match_requires_key_on_both_sides():
+    estimator = UtilityEstimator()
+    items = [
+        PoolItem(doc_id="w", content="W", metadata={"source": "wiki", "section": None}),
+        PoolItem(doc_id="x", content="X", metadata={"section": None}, sources={"bm25": 0.5}),
+        PoolItem(doc_id="y", content="Y", metadata={"category": "wiki"}, sources={"bm25": 0.5}),
+    ]
+    pool = CandidatePool(items)
+    context = RAGtuneContext(query="test", tracker=CostTracker(CostBudget(), ControllerTrace()))
+    pool.transition(["w"], ItemState.IN_FLIGHT)
+    pool.update_scores({"w": 0.9}, strategy="test")
+
+    estimates = estimator.value(pool, context)
+
+    assert estimates["x"].priority == pytest.approx(0.6)  # section present on both (None == None)
+    assert estimates["y"].priority == pytest.approx(0.5)  # same value under a different key
+
+def test_estimator_boost_capped_across_matching_winners():
+    estimator = UtilityEstimator()
+    items = [
+        PoolItem(doc_id="w1", content="W1", metadata={"source": "wiki"}),
+        PoolItem(doc_id="w2", content="W2", metadata={"source": "wiki"}),
+        PoolItem(doc_id="b", content="B", metadata={"source": "wiki"}, sources={"bm25": 0.5}),
+    ]
+    pool = CandidatePool(items)
+    context = RAGtuneContext(query="test", tracker=CostTracker(CostBudget(), ControllerTrace()))
+    pool.transition(["w1", "w2"], ItemState.IN_FLIGHT)
+    pool.update_scores({"w1": 0.9, "w2": 0.95}, strategy="test")
+
+    estimates = estimator.value(pool, context)
+
+    assert estimates["b"].priority == pytest.approx(0.6)
+
+def test_estimator_match_with_unhashable_metadata():
+    estimator = UtilityEstimator()
+    items = [
+        PoolItem(doc_id="w", content="W", metadata={"source": ["wiki"]}),
+        PoolItem(doc_id="x", content="X", metadata={"source": ["wiki"]}, sources={"bm25": 0.5}),
+        PoolItem(doc_id="y", content="Y", metadata={"source": ["news"]}, sources={"bm25": 0.5}),
+    ]
+    pool = CandidatePool(items)
+    context = RAGtuneContext(query="test", tracker=CostTracker(CostBudget(), ControllerTrace()))
+    pool.transition(["w"], ItemState.IN_FLIGHT)
+    pool.update_scores({"w": 0.9}, strategy="test")
+
+    estimates = estimator.value(pool, context)
+    assert estimates["x"].priority == pytest.approx(0.6)
+    assert estimates["y"].priority == 0.5
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_composite_estimator_weighted_aggregation(parallel):
+    from ragtune.components.estimators import BaselineEstimator, CompositeEstimator
+
+    class FixedEstimator(BaselineEstimator):
+        def __init__(self, outputs):
+            self.outputs = outputs
+
+        def value(self, pool, context):
+            return {d: EstimatorOutput(priority=p, predicted_quality=q) for d, (p, q) in self.outputs.items()}
+
+    composite = CompositeEstimator(
+        estimators=[
+            FixedEstimator({"a": (1.0, 0.8), "b": (0.5, None)}),
+            FixedEstimator({"c": (2.0, None), "a": (3.0, 0.4)}),
+        ],
+        weights=[1.0, 0.5],
+        parallel=parallel,
+    )
+    context = RAGtuneContext(query="test", tracker=CostTracker(CostBudget(), ControllerTrace()))
+
+    result = composite.value(CandidatePool(), context)
+
+    assert list(result) == ["a", "b", "c"]
+    assert result["a"].priority == pytest.approx(2.5)
+    assert result["a"].predicted_quality == pytest.approx(0.6)
+    assert result["b"].priority == pytest.approx(0.5)
+    assert result["b"].predicted_quality is None
+    assert result["c"].priority == pytest.approx(1.0)
+
+def test_composite_estimator_runs_members_in_order_by_default():
+    from ragtune.components.estimators import BaselineEstimator, CompositeEstimator
+
+    class TracingEstimator(BaselineEstimator):
+        def __init__(self, name):
+            self.name = name
+
+        def value(self, pool, context):
+            context.tracker.trace.add("estimator", self.name)
+            return super().value(pool, context)
+
+    composite = CompositeEstimator(estimators=[TracingEstimator(f"e{i}") for i in range(4)])
+    context = RAGtuneContext(query="test", tracker=CostTracker(CostBudget(), ControllerTrace()))
+
+    for _ in range(3):
+        composite.value(CandidatePool(), context)
+
+    assert [e.action for e in context.tracker.trace.events] == ["e0", "e1", "e2", "e3"] * 3
+
+def test_composite_estimator_reuses_its_thread_pool():
+    from ragtune.components.estimators import BaselineEstimator, CompositeEstimator
+
+    composite = CompositeEstimator(estimators=[BaselineEstimator(), BaselineEstimator()], parallel=True)
+    context = RAGtuneContext(query="test", tracker=CostTracker(CostBudget(), ControllerTrace()))
+
+    composite.value(CandidatePool(), context)
+    executor = composite._executor
+    composite.value(CandidatePool(), context)
+    assert executor is not None and composite._executor is executor
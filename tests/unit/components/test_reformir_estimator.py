@@ -105,3 +105,44 @@ def test_empty_eligible_returns_empty():
     ])
     outputs = est.value(pool, make_context())
     assert outputs == {}
+
+
+def test_regression_reused_when_reranked_set_unchanged():
+    from unittest.mock import patch
+
+    est = ReformIREstimator(min_reranked_for_regression=2)
+    pool = CandidatePool([
+        make_item("r1", {"original": 1.0, "rewrite_0": 0.0}, reranker_score=0.9),
+        make_item("r2", {"original": 0.0, "rewrite_0": 1.0}, reranker_score=0.2),
+        make_item("c1", {"original": 0.8, "rewrite_0": 0.2}),
+    ])
+    with patch("numpy.linalg.lstsq", wraps=np.linalg.lstsq) as solver:
+        first = est.value(pool, make_context())
+        second = est.value(pool, make_context())
+        assert solver.call_count == 1
+
+        pool._items["r2"].sources["rewrite_0"] = 0.5
+        est.value(pool, make_context())
+        assert solver.call_count == 2
+
+    assert second["c1"].priority == pytest.approx(first["c1"].priority)
+
+
+def test_closed_form_matches_bounded_solver():
+    import scipy.optimize
+
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        X = rng.random((8, 3))
+        true_w = rng.uniform(-0.5, 1.5, size=3)
+        y = X @ true_w
+        items = [
+            make_item(f"r{i}", {f"s{j}": float(X[i, j]) for j in range(3)}, reranker_score=float(y[i]))
+            for i in range(8)
+        ]
+        est = ReformIREstimator(min_reranked_for_regression=2)
+        est.value(CandidatePool(items + [make_item("c", {"s0": 1.0})]), make_context())
+
+        expected = scipy.optimize.lsq_linear(X, y, bounds=(0, 1)).x
+        learned = [est._learned_weights[f"s{j}"] for j in range(3)]
+        assert learned == pytest.approx(expected, abs=1e-6)
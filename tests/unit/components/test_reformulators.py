@@ -43,6 +43,14 @@ def test_llm_reformulator_handles_leading_trailing_text(mock_context):
         results = reformulator.generate(mock_context)
         assert len(results) == 2
 
+def test_llm_reformulator_ignores_brackets_after_json(mock_context):
+    with patch("litellm.completion") as mock_completion:
+        mock_completion.return_value = MockResponse('Here: ["how does [RAG] work", "explain retrieval"] (see [1])')
+
+        reformulator = LLMReformulator()
+        results = reformulator.generate(mock_context)
+        assert results == ["how does [RAG] work", "explain retrieval"]
+
 def test_llm_reformulator_drops_original_query(mock_context):
     with patch("litellm.completion") as mock_completion:
         # Original query is "What is RAG?"
@@ -0,0 +1,457 @@
+import sys
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pytest
+from ragtune.core.budget import CostBudget, CostTracker
+from ragtune.core.types import RAGtuneContext, ControllerTrace
+from ragtune.core.pool import PoolItem
+from ragtune.utils.config import config
+
+
+def make_context(query="what causes COVID"):
+    trace = ControllerTrace()
+    tracker = CostTracker(CostBudget(), trace)
+    return RAGtuneContext(query=query, tracker=tracker)
+
+
+def make_item(doc_id, content="doc content", score=0.5):
+    return PoolItem(doc_id=doc_id, content=content, sources={"original": score})
+
+
+def completion_response(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def pointwise_prompts(monkeypatch):
+    prompts = {"system": "Score relevance.", "user": "Q: {query}\nD: {document}"}
+    monkeypatch.setitem(config._config, "prompts", {"reranking": {"pointwise": prompts}})
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class AuthenticationError(Exception):
+    pass
+
+
+@pytest.fixture
+def mock_litellm(monkeypatch):
+    mock = MagicMock()
+    mock.RateLimitError = RateLimitError
+    mock.AuthenticationError = AuthenticationError
+    monkeypatch.setitem(sys.modules, "litellm", mock)
+    return mock
+
+
+def test_llm_reranker_scores_documents_concurrently(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker
+
+    n_docs = 4
+    barrier = threading.Barrier(n_docs, timeout=5)
+
+    def completion(model, messages, response_format):
+        # Every call blocks until all n_docs are in flight at once.
+        barrier.wait()
+        doc = messages[1]["content"].split("D: ")[1]
+        return completion_response(json.dumps({"relevance_score": float(doc[-1]) / 10}))
+
+    mock_litellm.completion.side_effect = completion
+    reranker = LLMReranker(max_workers=n_docs)
+    docs = [make_item(f"d{i}", content=f"text {i}") for i in range(n_docs)]
+
+    scores = reranker.rerank(docs, make_context())
+
+    assert list(scores) == ["d0", "d1", "d2", "d3"]
+    assert scores == {f"d{i}": pytest.approx(i / 10) for i in range(n_docs)}
+
+
+def test_llm_reranker_failed_document_scores_zero(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker
+
+    def completion(model, messages, response_format):
+        if "bad" in messages[1]["content"]:
+            raise RateLimitError("rate limited")
+        if "junk" in messages[1]["content"]:
+            return completion_response("not json")
+        return completion_response('{"relevance_score": 0.7}')
+
+    mock_litellm.completion.side_effect = completion
+    docs = [make_item("ok", "fine"), make_item("err", "bad"), make_item("parse", "junk")]
+    context = make_context()
+
+    scores = LLMReranker(max_workers=2).rerank(docs, context)
+
+    assert scores == {"ok": pytest.approx(0.7), "err": 0.0, "parse": 0.0}
+    event = context.tracker.trace.events[-1]
+    assert event.action == "llm_partial_failure"
+    assert event.details["failed"] == 1 and event.details["calls"] == 3
+
+
+@pytest.mark.parametrize("error, fail_all", [
+    (AuthenticationError("invalid api key"), False),
+    (RateLimitError("rate limited"), True),
+])
+def test_llm_reranker_raises_unrecoverable_failures(pointwise_prompts, mock_litellm, error, fail_all):
+    from ragtune.components.rerankers import LLMReranker
+
+    def completion(model, messages, response_format):
+        if fail_all or "bad" in messages[1]["content"]:
+            raise error
+        return completion_response('{"relevance_score": 0.7}')
+
+    mock_litellm.completion.side_effect = completion
+    docs = [make_item("ok", "fine"), make_item("err", "bad")]
+
+    with pytest.raises(type(error)):
+        LLMReranker(max_workers=2).rerank(docs, make_context())
+
+
+@pytest.mark.asyncio
+async def test_llm_reranker_arerank_gathers_completions(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker, MultiStrategyReranker
+
+    async def acompletion(model, messages, response_format):
+        if "bad" in messages[1]["content"]:
+            raise RateLimitError("timeout")
+        return completion_response('{"relevance_score": 0.6}')
+
+    mock_litellm.acompletion.side_effect = acompletion
+    docs = [make_item("ok", "fine"), make_item("err", "bad")]
+    router = MultiStrategyReranker(strategies={"llm": LLMReranker()}, default_strategy="llm")
+
+    scores = await router.arerank(docs, make_context())
+
+    assert scores == {"ok": pytest.approx(0.6), "err": 0.0}
+    assert mock_litellm.acompletion.call_count == 2
+    mock_litellm.completion.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_llm_reranker_arerank_raises_unrecoverable_failures(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker
+
+    async def acompletion(model, messages, response_format):
+        if "bad" in messages[1]["content"]:
+            raise AuthenticationError("invalid api key")
+        return completion_response('{"relevance_score": 0.6}')
+
+    mock_litellm.acompletion.side_effect = acompletion
+    docs = [make_item("ok", "fine"), make_item("err", "bad")]
+
+    with pytest.raises(AuthenticationError):
+        await LLMReranker().arerank(docs, make_context())
+
+
+@pytest.mark.asyncio
+async def test_default_arerank_delegates_to_rerank():
+    from ragtune.components.rerankers import SimulatedReranker
+
+    docs = [make_item("d1", "what causes COVID here"), make_item("d2", "unrelated")]
+    reranker = SimulatedReranker()
+
+    assert await reranker.arerank(docs, make_context()) == reranker.rerank(docs, make_context())
+
+
+def test_cross_encoder_predicts_all_pairs_in_one_batched_call():
+    with patch("sentence_transformers.CrossEncoder") as mock_ce:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        mock_ce.return_value.predict.return_value = np.array([0.2, 0.9], dtype=np.float32)
+        reranker = CrossEncoderReranker(batch_size=16, max_length=128, max_chars=5)
+        docs = [make_item("d1", "short"), make_item("d2", "a much longer document")]
+
+        scores = reranker.rerank(docs, make_context("q"))
+
+        assert mock_ce.call_args.kwargs["max_length"] == 128
+        mock_ce.return_value.predict.assert_called_once_with(
+            [["q", "short"], ["q", "a muc"]],
+            batch_size=16,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        assert scores == {"d1": pytest.approx(0.2), "d2": pytest.approx(0.9)}
+
+
+def test_cross_encoder_falls_back_to_torch_backend():
+    with patch("sentence_transformers.CrossEncoder") as mock_ce:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        def load(model_name, **kwargs):
+            if kwargs.get("backend", "torch") != "torch":
+                raise ImportError("onnxruntime is not installed")
+            return MagicMock()
+
+        mock_ce.side_effect = load
+        reranker = CrossEncoderReranker(backend="onnx", model_kwargs={"file_name": "onnx/model_O4.onnx"})
+
+        assert reranker.backend == "torch"
+        assert mock_ce.call_count == 2
+
+
+def test_cross_encoder_keeps_full_documents_by_default():
+    with patch("sentence_transformers.CrossEncoder") as mock_ce:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        mock_ce.return_value.predict.return_value = np.array([0.5], dtype=np.float32)
+        long_doc = "word " * 1000
+        CrossEncoderReranker().rerank([make_item("d1", long_doc)], make_context("q"))
+
+        assert mock_ce.call_args.kwargs["max_length"] is None
+        assert mock_ce.return_value.predict.call_args.args[0] == [["q", long_doc]]
+
+
+def test_cross_encoder_default_load_works_before_backend_support():
+    with patch("sentence_transformers.CrossEncoder") as mock_ce:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        CrossEncoderReranker()
+
+        mock_ce.assert_called_once()
+        assert "backend" not in mock_ce.call_args.kwargs
+        assert "model_kwargs" not in mock_ce.call_args.kwargs
+
+
+def test_cross_encoder_rejects_unknown_backend():
+    from ragtune.components.rerankers import CrossEncoderReranker
+
+    with pytest.raises(ValueError, match="Unknown backend"):
+        CrossEncoderReranker(backend="tensorrt")
+
+
+@pytest.mark.parametrize("device, halved", [("cuda", True), ("cpu", False)])
+def test_cross_encoder_fp16_only_on_gpu(device, halved):
+    with patch("sentence_transformers.CrossEncoder") as mock_ce:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        mock_ce.return_value.device = SimpleNamespace(type=device)
+        CrossEncoderReranker(device=device, fp16=True)
+
+        assert mock_ce.return_value.half.called is halved
+
+
+def test_cross_encoder_quantized_export_is_cached(tmp_path):
+    with patch("sentence_transformers.CrossEncoder") as mock_ce, \
+            patch("sentence_transformers.backend.export_dynamic_quantized_onnx_model") as mock_export:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        def export(model, quantize, path):
+            target = tmp_path / "org__model" / "onnx" / f"model_qint8_{quantize}.onnx"
+            target.parent.mkdir(parents=True)
+            target.touch()
+
+        mock_export.side_effect = export
+        first = CrossEncoderReranker("org/model", quantize="avx512_vnni", quantize_cache=str(tmp_path))
+        second = CrossEncoderReranker("org/model", quantize="avx512_vnni", quantize_cache=str(tmp_path))
+
+        assert first.backend == second.backend == "onnx"
+        assert first.quantize == "avx512_vnni"
+        mock_export.assert_called_once()
+        assert mock_ce.call_args.kwargs["model_kwargs"] == {"file_name": "onnx/model_qint8_avx512_vnni.onnx"}
+        assert mock_ce.call_args.args[0] == str(tmp_path / "org__model")
+
+
+def test_cross_encoder_quantize_falls_back_without_optimum(tmp_path):
+    with patch("sentence_transformers.CrossEncoder") as mock_ce, \
+            patch("sentence_transformers.backend.export_dynamic_quantized_onnx_model",
+                  side_effect=ImportError("optimum is not installed")):
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        reranker = CrossEncoderReranker("org/model", quantize="avx2", quantize_cache=str(tmp_path))
+
+        assert reranker.quantize is None
+        assert reranker.backend == "torch"
+        assert mock_ce.call_args.args[0] == "org/model"
+
+
+def test_ollama_listwise_prompt_lists_every_document(mock_litellm):
+    from ragtune.components.rerankers import OllamaListwiseReranker
+
+    mock_litellm.completion.return_value = completion_response(
+        '{"rankings": [{"doc_id": "d2", "relevance_score": 0.8}]}'
+    )
+    docs = [make_item("d1", "first"), make_item("d2", "second " * 200)]
+
+    scores = OllamaListwiseReranker().rerank(docs, make_context())
+
+    prompt = mock_litellm.completion.call_args.kwargs["messages"][1]["content"]
+    assert "Document ID: d1\nContent: first\n---\n" in prompt
+    assert f"Document ID: d2\nContent: {docs[1].content[:500]}\n---\n" in prompt
+    assert scores == {"d1": 0.0, "d2": pytest.approx(0.8)}
+
+
+def test_cross_encoder_only_predicts_uncached_pairs():
+    with patch("sentence_transformers.CrossEncoder") as mock_ce:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        predict = mock_ce.return_value.predict
+        predict.side_effect = lambda pairs, **kwargs: np.array([len(d) / 10 for _, d in pairs])
+        reranker = CrossEncoderReranker()
+
+        reranker.rerank([make_item("d1", "abc")], make_context("q"))
+        scores = reranker.rerank([make_item("d2", "abcde"), make_item("d1", "abc")], make_context("q"))
+
+        assert list(scores) == ["d2", "d1"]
+        assert scores == {"d2": pytest.approx(0.5), "d1": pytest.approx(0.3)}
+        assert predict.call_args.args[0] == [["q", "abcde"]]
+
+        # A different query or changed content is a miss
+        reranker.rerank([make_item("d1", "abc")], make_context("other"))
+        reranker.rerank([make_item("d1", "abcd")], make_context("q"))
+        assert predict.call_count == 4
+
+
+def test_llm_reranker_caches_successes_not_failures(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker
+
+    calls = []
+
+    def completion(model, messages, response_format):
+        calls.append(messages[1]["content"])
+        if "bad" in messages[1]["content"]:
+            raise RateLimitError("rate limited")
+        return completion_response('{"relevance_score": 0.4}')
+
+    mock_litellm.completion.side_effect = completion
+    reranker = LLMReranker(max_workers=1)
+    docs = [make_item("ok", "fine"), make_item("err", "bad")]
+
+    scores = reranker.rerank(docs, make_context())
+    assert scores == {"ok": pytest.approx(0.4), "err": 0.0}
+
+    # Only the failed document is retried; with nothing else to score, its
+    # failure is no longer partial and is raised
+    with pytest.raises(RateLimitError):
+        reranker.rerank(docs, make_context())
+    assert len(calls) == 3
+
+
+def test_reranker_cache_can_be_disabled(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker
+
+    mock_litellm.completion.return_value = completion_response('{"relevance_score": 0.4}')
+    reranker = LLMReranker(cache_size=0)
+
+    reranker.rerank([make_item("d1")], make_context())
+    reranker.rerank([make_item("d1")], make_context())
+
+    assert mock_litellm.completion.call_count == 2
+
+
+@pytest.mark.parametrize("content", [
+    '{"rankings": [{"doc_id": "d1", "score": 0.9}, {"id": "d2", "relevance_score": 0.3}]}',
+    'Here you go:\n```json\n{"rankings": [{"doc_id": "d1", "score": 0.9}, {"id": "d2", "relevance_score": 0.3}]}\n```\nDone.',
+    '  [{"doc_id": "d1", "score": 0.9}, {"doc_id": "d2", "score": 0.3}]  ',
+])
+def test_ollama_listwise_parses_fenced_and_bare_json(mock_litellm, content):
+    from ragtune.components.rerankers import OllamaListwiseReranker
+
+    mock_litellm.completion.return_value = completion_response(content)
+    docs = [make_item("d1"), make_item("d2"), make_item("d3")]
+
+    scores = OllamaListwiseReranker().rerank(docs, make_context())
+
+    assert scores == {"d1": pytest.approx(0.9), "d2": pytest.approx(0.3), "d3": 0.0}
+
+
+def test_ollama_listwise_unparseable_response_scores_zero(mock_litellm):
+    from ragtune.components.rerankers import OllamaListwiseReranker
+
+    mock_litellm.completion.return_value = completion_response("```json\nnot json\n```")
+    context = make_context()
+
+    scores = OllamaListwiseReranker().rerank([make_item("d1")], context)
+
+    assert scores == {"d1": 0.0}
+    assert any(e.action == "ollama_error" for e in context.tracker.trace.events)
+
+
+def test_llm_reranker_listwise_windows(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker
+
+    def completion(model, messages, response_format):
+        prompt = messages[1]["content"]
+        if "Document ID:" not in prompt:
+            return completion_response('{"relevance_score": 0.1}')
+        ids = [line.split(": ")[1] for line in prompt.splitlines() if line.startswith("Document ID:")]
+        if "d2" in ids:
+            return completion_response("```json\nnope\n```")
+        # d1 is left unranked by the model
+        return completion_response(json.dumps([{"id": i, "relevance_score": 0.5} for i in ids if i != "d1"]))
+
+    mock_litellm.completion.side_effect = completion
+    reranker = LLMReranker(listwise_window=2, max_workers=1)
+    docs = [make_item(f"d{i}", content=f"text {i}") for i in range(5)]
+
+    scores = reranker.rerank(docs, make_context())
+
+    # Windows [d0, d1], [d2, d3] and pointwise [d4]
+    assert mock_litellm.completion.call_count == 3
+    assert scores == {"d0": 0.5, "d1": 0.0, "d2": 0.0, "d3": 0.0, "d4": pytest.approx(0.1)}
+
+    # Only the failed window is requested again
+    reranker.rerank(docs, make_context())
+    assert mock_litellm.completion.call_count == 4
+
+
+def test_llm_reranker_reads_prompts_once(pointwise_prompts, mock_litellm, monkeypatch):
+    from ragtune.components.rerankers import LLMReranker
+
+    mock_litellm.completion.return_value = completion_response('{"relevance_score": 0.4}')
+    reranker = LLMReranker(cache_size=0)
+    reranker.rerank([make_item("d1")], make_context())
+
+    lookups = MagicMock(side_effect=AssertionError("prompts looked up again"))
+    monkeypatch.setattr(config, "get", lookups)
+    monkeypatch.setattr(config, "get_prompt", lookups)
+
+    assert reranker.rerank([make_item("d1")], make_context()) == {"d1": pytest.approx(0.4)}
+
+
+def test_cross_encoder_scores_duplicate_content_once():
+    with patch("sentence_transformers.CrossEncoder") as mock_ce:
+        from ragtune.components.rerankers import CrossEncoderReranker
+
+        predict = mock_ce.return_value.predict
+        predict.side_effect = lambda pairs, **kwargs: np.array([len(d) / 10 for _, d in pairs])
+        docs = [make_item("a", "same text"), make_item("b", "other"), make_item("c", "same text")]
+
+        scores = CrossEncoderReranker().rerank(docs, make_context("q"))
+
+        assert predict.call_args.args[0] == [["q", "same text"], ["q", "other"]]
+        assert scores == {"a": pytest.approx(0.9), "b": pytest.approx(0.5), "c": pytest.approx(0.9)}
+
+
+def test_llm_reranker_scores_duplicate_content_once(pointwise_prompts, mock_litellm):
+    from ragtune.components.rerankers import LLMReranker
+
+    mock_litellm.completion.return_value = completion_response('{"relevance_score": 0.7}')
+    reranker = LLMReranker(max_workers=1)
+    docs = [make_item("a", "same text"), make_item("b", "same text")]
+
+    assert reranker.rerank(docs, make_context()) == {"a": pytest.approx(0.7), "b": pytest.approx(0.7)}
+    assert mock_litellm.completion.call_count == 1
+
+    # Both aliases were cached
+    reranker.rerank([make_item("b", "same text")], make_context())
+    assert mock_litellm.completion.call_count == 1
+
+
+def test_multi_strategy_routes_to_named_then_default_strategy():
+    from ragtune.components.rerankers import MultiStrategyReranker, NoOpReranker, SimulatedReranker
+
+    docs = [make_item("d1", "what causes COVID", score=0.4)]
+    router = MultiStrategyReranker(
+        strategies={"noop": NoOpReranker(), "simulated": SimulatedReranker()}, default_strategy="noop"
+    )
+
+    assert router.rerank(docs, make_context(), strategy="simulated") == {"d1": 0.95}
+    assert router.rerank(docs, make_context(), strategy="unknown") == {"d1": 0.4}
+    assert router.rerank(docs, make_context()) == {"d1": 0.4}
+
+    unrouted = MultiStrategyReranker(strategies={"simulated": SimulatedReranker()})
+    assert unrouted.rerank(docs, make_context(), strategy="llm") == {"d1": 0.0}
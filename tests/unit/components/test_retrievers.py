@@ -0,0 +1,36 @@
+from ragtune.components.retrievers import InMemoryRetriever
+from ragtune.core.budget import CostBudget, CostTracker
+from ragtune.core.types import RAGtuneContext, ControllerTrace
+
+
+def make_context(query):
+    return RAGtuneContext(query=query, tracker=CostTracker(CostBudget(), ControllerTrace()))
+
+
+def make_retriever(*contents):
+    return InMemoryRetriever([{"id": f"d{i}", "content": c, "score": 1.0} for i, c in enumerate(contents)])
+
+
+def test_in_memory_retriever_matches_case_insensitive_substrings():
+    retriever = make_retriever("The Quick fox", "lazy dog", "quick QUICK quick", "quic", "")
+
+    results = retriever.retrieve(make_context("QUICK"), top_k=10)
+
+    assert [d.id for d in results] == ["d0", "d2"]
+
+
+def test_in_memory_retriever_match_does_not_span_documents():
+    retriever = make_retriever("ends with qu", "ick starts here")
+
+    # No match anywhere falls back to the whole corpus
+    assert [d.id for d in retriever.retrieve(make_context("quick"), top_k=10)] == ["d0", "d1"]
+    assert [d.id for d in retriever.retrieve(make_context("ick"), top_k=10)] == ["d1"]
+
+
+def test_in_memory_retriever_stops_after_top_k_matches():
+    retriever = make_retriever("fox one", "dog", "fox two", "fox three")
+    retriever.docs[3] = None  # never reached: the scan stops at top_k
+
+    results = retriever.retrieve(make_context("fox"), top_k=2)
+
+    assert [d.id for d in results] == ["d0", "d2"]
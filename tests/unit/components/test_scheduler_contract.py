@@ -1,7 +1,7 @@
 import pytest
 from ragtune.core.pool import CandidatePool, PoolItem, ItemState
 from ragtune.core.types import RemainingBudgetView, BatchProposal, CostObject
-from ragtune.components.schedulers import ActiveLearningScheduler
+from ragtune.components.schedulers import ActiveLearningScheduler, GracefulDegradationScheduler
 
 def test_c13_selects_subset_of_eligible():
     items = [
@@ -83,3 +83,103 @@ def test_c17_strategy_escalation_logic():
     pool.get_items(["d2"])[0].priority_value = 0.8
     prop2 = scheduler.select_batch(pool, budget)
     assert prop2.strategy == "cross_encoder"
+
+def test_escalation_gap_is_configurable():
+    items = [
+        PoolItem(doc_id="d1", content="", priority_value=0.9, initial_rank=1),
+        PoolItem(doc_id="d2", content="", priority_value=0.8, initial_rank=2)
+    ]
+    budget = RemainingBudgetView(remaining_tokens=1000, remaining_rerank_docs=10, remaining_rerank_calls=10)
+
+    wide = ActiveLearningScheduler(batch_size=5, escalation_gap=0.2)
+    assert wide.select_batch(CandidatePool(items), budget).strategy == "llm"
+
+    # A single-document batch has nothing to break a tie with
+    single = ActiveLearningScheduler(batch_size=1, escalation_gap=0.2)
+    assert single.select_batch(CandidatePool(items), budget).strategy == "cross_encoder"
+
+def test_active_learning_batch_matches_full_sort():
+    items = [
+        PoolItem(doc_id=f"d{i:02d}", content="", priority_value=(i * 7 % 5) / 5, initial_rank=i % 3)
+        for i in range(30)
+    ]
+    pool = CandidatePool(items)
+    budget = RemainingBudgetView(
+        remaining_tokens=1000, remaining_rerank_docs=10,
+        remaining_rerank_calls=10, assembly_token_buffer=0
+    )
+    scheduler = ActiveLearningScheduler(batch_size=6)
+
+    expected = sorted(items, key=lambda x: (-x.priority_value, x.initial_rank, x.doc_id))[:6]
+    assert scheduler.select_batch(pool, budget).doc_ids == [it.doc_id for it in expected]
+
+def test_graceful_degradation_spends_llm_then_cross_encoder():
+    reranked = [
+        PoolItem(doc_id=f"r{i}", content="", state=ItemState.RERANKED, reranker_strategy="llm")
+        for i in range(2)
+    ]
+    candidates = [
+        PoolItem(doc_id=f"c{i:02d}", content="", priority_value=(i * 7 % 5) / 5, initial_rank=i % 3)
+        for i in range(20)
+    ]
+    pool = CandidatePool(reranked + candidates)
+    budget = RemainingBudgetView(
+        remaining_tokens=1000, remaining_rerank_docs=10,
+        remaining_rerank_calls=10, assembly_token_buffer=0
+    )
+    scheduler = GracefulDegradationScheduler(llm_limit=3, cross_encoder_limit=4, batch_size=5)
+
+    expected = sorted(candidates, key=lambda x: (-x.priority_value, x.initial_rank, x.doc_id))
+    proposal = scheduler.select_batch(pool, budget)
+    assert proposal.strategy == "llm"
+    assert proposal.doc_ids == [expected[0].doc_id]  # one llm slot left
+
+    # LLM limit reached: falls back to the cross-encoder limit
+    extra = PoolItem(doc_id="r2", content="", state=ItemState.RERANKED, reranker_strategy="llm")
+    pool = CandidatePool(reranked + [extra] + candidates)
+    proposal = scheduler.select_batch(pool, budget)
+    assert proposal.strategy == "cross_encoder"
+    assert proposal.doc_ids == [it.doc_id for it in expected[:4]]
+
+def test_graceful_degradation_sees_direct_state_changes():
+    candidates = [PoolItem(doc_id=f"c{i}", content="", priority_value=i / 10) for i in range(6)]
+    pool = CandidatePool(candidates)
+    budget = RemainingBudgetView(remaining_tokens=1000, remaining_rerank_docs=10, remaining_rerank_calls=10)
+    scheduler = GracefulDegradationScheduler(llm_limit=2, cross_encoder_limit=4, batch_size=5)
+
+    # Items moved without going through the pool still count toward the llm limit
+    for it in candidates[:2]:
+        it.state = ItemState.RERANKED
+        it.reranker_strategy = "llm"
+
+    proposal = scheduler.select_batch(pool, budget)
+    assert proposal.strategy == "cross_encoder"
+    assert proposal.doc_ids == ["c5", "c4", "c3", "c2"]
+
+@pytest.mark.parametrize("n_items", [10, 500])
+def test_large_pool_batch_matches_full_sort_with_ties(n_items):
+    # Few distinct priorities, so the batch boundary falls inside a tie
+    items = [
+        PoolItem(doc_id=f"d{i:03d}", content="", priority_value=(i % 4) / 4, initial_rank=(i * 13) % 7)
+        for i in range(n_items)
+    ]
+    pool = CandidatePool(items)
+    budget = RemainingBudgetView(
+        remaining_tokens=1000, remaining_rerank_docs=100,
+        remaining_rerank_calls=10, assembly_token_buffer=0
+    )
+    scheduler = ActiveLearningScheduler(batch_size=7)
+
+    expected = sorted(items, key=lambda x: (-x.priority_value, x.initial_rank, x.doc_id))[:7]
+    assert scheduler.select_batch(pool, budget).doc_ids == [it.doc_id for it in expected]
+
+@pytest.mark.parametrize("scheduler", [
+    ActiveLearningScheduler(batch_size=0),
+    GracefulDegradationScheduler(batch_size=0),
+])
+def test_zero_batch_size_proposes_nothing(scheduler):
+    pool = CandidatePool([PoolItem(doc_id=f"d{i}", content="", priority_value=i / 10) for i in range(3)])
+    budget = RemainingBudgetView(remaining_tokens=1000, remaining_rerank_docs=10, remaining_rerank_calls=10)
+
+    # An empty proposal would consume nothing and keep the controller looping
+    assert scheduler.select_batch(pool, budget) is None
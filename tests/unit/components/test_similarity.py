@@ -42,3 +42,124 @@ def test_similarity_estimator_boosting():
         assert "b" in estimates
         # Mock returns identical vectors, so similarity is max
         assert estimates["b"].priority > 0.0
+
+def test_similarity_estimator_reuses_cached_embeddings():
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        vectors = {"fox": [1.0, 0.0], "dog": [0.0, 1.0], "fox too": [1.0, 0.0]}
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.array([vectors[t] for t in texts])
+
+        estimator = SimilarityEstimator(model_name="mock")
+        items = [
+            PoolItem(doc_id="a", content="fox", sources={"ret": 0.5}),
+            PoolItem(doc_id="b", content="dog", sources={"ret": 0.4}),
+            PoolItem(doc_id="c", content="fox too", sources={"ret": 0.4}),
+        ]
+        pool = CandidatePool(items)
+        context = RAGtuneContext(query="fox", tracker=CostTracker(CostBudget(), ControllerTrace()))
+
+        pool.transition(["a"], ItemState.IN_FLIGHT)
+        pool.update_scores({"a": 1.0}, strategy="test")
+
+        first = estimator.value(pool, context)
+        assert first["c"].priority == pytest.approx(0.4 * 1.5)
+        assert first["b"].priority == pytest.approx(0.4)
+        assert first["c"].predicted_quality == pytest.approx(1.0)
+
+        assert mock_model.encode.call_count == 1
+        encoded = mock_model.encode.call_args.args[0]
+        mock_model.encode.reset_mock()
+        estimator.value(pool, context)
+
+        assert sorted(encoded) == ["dog", "fox", "fox too"]
+        mock_model.encode.assert_not_called()
+
+@pytest.mark.parametrize("precision,dtype", [("float16", np.float16), ("int8", np.int8)])
+def test_similarity_estimator_reduced_precision(precision, dtype):
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        vectors = {"fox": [1.0, 0.0], "dog": [0.0, 1.0], "fox-ish": [0.8, 0.6]}
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.array([vectors[t] for t in texts])
+
+        estimator = SimilarityEstimator(model_name="mock", precision=precision)
+        items = [
+            PoolItem(doc_id="a", content="fox", sources={"ret": 0.5}),
+            PoolItem(doc_id="b", content="dog", sources={"ret": 0.4}),
+            PoolItem(doc_id="c", content="fox-ish", sources={"ret": 0.4}),
+        ]
+        pool = CandidatePool(items)
+        context = RAGtuneContext(query="fox", tracker=CostTracker(CostBudget(), ControllerTrace()))
+        pool.transition(["a"], ItemState.IN_FLIGHT)
+        pool.update_scores({"a": 1.0}, strategy="test")
+
+        estimates = estimator.value(pool, context)
+
+        assert estimator._norm_cache["c"].dtype == dtype
+        assert estimates["c"].predicted_quality == pytest.approx(0.8, abs=1e-2)
+        assert estimates["b"].predicted_quality == pytest.approx(0.0, abs=1e-2)
+
+def test_similarity_estimator_rejects_unknown_precision():
+    with pytest.raises(ValueError, match="precision"):
+        SimilarityEstimator(model_name="mock", precision="bfloat16")
+
+def test_similarity_estimator_skips_work_without_eligible_items():
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        estimator = SimilarityEstimator(model_name="mock")
+
+        pool = CandidatePool([PoolItem(doc_id="a", content="fox", sources={"ret": 0.5})])
+        pool.transition(["a"], ItemState.IN_FLIGHT)
+        pool.update_scores({"a": 1.0}, strategy="test")
+        context = RAGtuneContext(query="fox", tracker=CostTracker(CostBudget(), ControllerTrace()))
+
+        assert estimator.value(pool, context) == {}
+        mock_model.encode.assert_not_called()
+
+def test_similarity_estimator_cache_evicts_least_recently_used():
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_model = MagicMock()
+        mock_st.return_value = mock_model
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.array([[1.0, 0.0] for _ in texts])
+
+        estimator = SimilarityEstimator(model_name="mock", cache_size=2)
+        a, b, c = (PoolItem(doc_id=d, content=d) for d in "abc")
+
+        estimator._embed([a, b])
+        estimator._embed([a])
+        embs = estimator._embed([c, b])
+
+        assert embs.shape == (2, 2)
+        assert list(estimator._norm_cache) == ["b", "c"]
+
+@pytest.mark.parametrize("device,halved", [("cuda", True), ("cpu", False)])
+def test_similarity_estimator_fp16_only_on_gpu(device, halved):
+    with patch("sentence_transformers.SentenceTransformer") as mock_st:
+        mock_model = MagicMock()
+        mock_model.device.type = device
+        mock_st.return_value = mock_model
+
+        SimilarityEstimator(model_name="mock", fp16=True)
+
+        assert mock_model.half.called is halved
+
+@pytest.mark.parametrize("precision", ["float32", "float16", "int8"])
+@pytest.mark.parametrize("n_a,n_b", [(5, 1), (1, 4), (1, 1)])
+def test_similarity_single_row_matches_full_matmul(precision, n_a, n_b):
+    with patch("sentence_transformers.SentenceTransformer"):
+        estimator = SimilarityEstimator(model_name="mock", precision=precision)
+    rng = np.random.default_rng(0)
+    a = rng.integers(-127, 128, size=(n_a, 8)) if precision == "int8" else rng.standard_normal((n_a, 8))
+    b = rng.integers(-127, 128, size=(n_b, 8)) if precision == "int8" else rng.standard_normal((n_b, 8))
+    dtype = {"float32": np.float32, "float16": np.float16, "int8": np.int8}[precision]
+    a, b = a.astype(dtype), b.astype(dtype)
+
+    sims = estimator._similarities(a, b)
+    compute = np.int32 if precision == "int8" else np.float32
+    expected = a.astype(compute) @ b.astype(compute).T
+    if precision == "int8":
+        expected = expected / float(SimilarityEstimator.INT8_SCALE ** 2)
+    assert sims.shape == (n_a, n_b)
+    np.testing.assert_allclose(sims, expected, rtol=1e-6)
@@ -64,3 +64,26 @@ def test_active_items_filtering():
     assert active_ids == {"d1", "d2"}
     assert "d3" not in active_ids
     assert "d4" not in active_ids
+
+def test_get_reranked_returns_only_reranked_items():
+    items = [PoolItem(doc_id=f"d{i}", content="c") for i in range(4)]
+    pool = CandidatePool(items)
+    pool.transition(["d1", "d2", "d3"], ItemState.IN_FLIGHT)
+    pool.update_scores({"d1": 0.9, "d3": 0.2}, strategy="test")
+
+    assert [it.doc_id for it in pool.get_reranked()] == ["d1", "d3"]
+
+def test_source_matrix_aligns_sources():
+    items = [
+        PoolItem(doc_id="d1", content="c", sources={"original": 0.5, "rewrite_0": 0.7}),
+        PoolItem(doc_id="d2", content="c", sources={"original": 0.2}),
+    ]
+    pool = CandidatePool(items)
+
+    names, S = pool.source_matrix()
+    assert names == ["original", "rewrite_0"]
+    assert S.tolist() == [[0.5, 0.7], [0.2, 0.0]]
+
+    names, S = pool.source_matrix(items[1:], ["rewrite_0", "original"])
+    assert names == ["rewrite_0", "original"]
+    assert S.tolist() == [[0.0, 0.2]]
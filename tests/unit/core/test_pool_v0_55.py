@@ -62,3 +62,22 @@ def test_pool_initial_rank_tracking():
     pool.add_items(docs2, source="rewrite")
     assert pool._items["doc3"].initial_rank == 0
     assert pool._items["doc3"].appearances_count == 2
+
+def test_pool_item_max_source_score_tracks_mutation():
+    item = PoolItem(doc_id="d", content="c")
+    assert item.max_source_score == 0.0
+
+    item.sources["bm25"] = 0.5
+    assert item.max_source_score == 0.5
+
+    item.sources.update({"rewrite_0": 0.7})
+    assert item.max_source_score == 0.7
+
+    del item.sources["rewrite_0"]
+    assert item.max_source_score == 0.5
+    assert item.final_score() == 0.5
+
+def test_pool_item_content_tokens_computed_once():
+    item = PoolItem(doc_id="d", content="one two three four five six seven eight nine ten")
+    assert item.content_tokens == 13
+    assert item._content_tokens == 13
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+from ragtune.registry import BUILTIN_COMPONENTS, Registry, registry
+
+
+def test_builtin_lookup_imports_defining_module():
+    from ragtune.components.schedulers import ActiveLearningScheduler
+
+    assert registry.get_scheduler("active-learning") is ActiveLearningScheduler
+    assert registry.get_scheduler("does-not-exist") is None
+
+
+def test_lookup_only_imports_needed_module():
+    code = (
+        "import sys\n"
+        "from ragtune.registry import registry\n"
+        "assert registry.get_assembler('greedy') is not None\n"
+        "assert 'ragtune.components.assemblers' in sys.modules\n"
+        "assert 'ragtune.components.rerankers' not in sys.modules\n"
+        "assert 'ragtune.adapters.langchain' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lightweight_components_do_not_import_numpy():
+    code = (
+        "import sys\n"
+        "from ragtune.registry import registry\n"
+        "assert registry.get_estimator('baseline') is not None\n"
+        "assert registry.get_estimator('utility') is not None\n"
+        "assert registry.get_assembler('greedy') is not None\n"
+        "assert 'numpy' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_list_names_includes_builtins_and_custom_registrations():
+    reg = Registry()
+
+    @reg.scheduler("custom")
+    class CustomScheduler:
+        pass
+
+    names = reg.list_names("scheduler")
+    assert names[: len(BUILTIN_COMPONENTS["scheduler"])] == list(BUILTIN_COMPONENTS["scheduler"])
+    assert "custom" in names
+    assert reg.list_names("nonexistent_component") == []
+
+
+def test_version_changes_only_when_a_name_is_replaced():
+    reg = Registry()
+
+    class First:
+        pass
+
+    class Second:
+        pass
+
+    reg.reranker("custom")(First)
+    reg.reranker("custom")(First)
+    assert reg.version == 0
+
+    reg.reranker("custom")(Second)
+    assert reg.version == 1
+    assert reg.get_reranker("custom") is Second